@@ -0,0 +1,109 @@
+# bench.py
+"""
+Rough benchmarks for the task store (not part of the app).
+
+    python bench.py                 # load 1,000,000 tasks
+    python bench.py load 200000     # smaller store
+    python bench.py startup 100000  # backend part of GUI startup
+"""
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BASE_DIR)
+
+PRIORITIES = ["High", "Medium", "Low"]
+CATEGORIES = ["General", "College", "Personal", "Work"]
+
+
+def make_store(path, n):
+    rnd = random.Random(42)
+    tasks = []
+    for i in range(n):
+        tasks.append({
+            "id": str(uuid.UUID(int=rnd.getrandbits(128))),
+            "title": f"Task {i}",
+            "deadline": f"2026-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+            "priority": rnd.choice(PRIORITIES),
+            "category": rnd.choice(CATEGORIES),
+            "done": rnd.random() < 0.5,
+            "created_at": f"2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}"
+        })
+    with open(path, "w") as f:
+        json.dump({"tasks": tasks, "streak": 0, "last_done_date": None}, f)
+
+
+def rss_kb():
+    # current resident set size, Linux only
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+# --------------------------
+# Benchmarks (run in a fresh child process)
+# --------------------------
+def child_load(path):
+    from todo_backend import TaskManager
+
+    before = rss_kb()
+    t0 = time.perf_counter()
+    tm = TaskManager(path)
+    elapsed = time.perf_counter() - t0
+    print(f"tasks:      {len(tm.tasks)}")
+    print(f"load time:  {elapsed:.2f} s")
+    print(f"rss delta:  {(rss_kb() - before) / 1024:.0f} MB")
+
+
+def child_startup(path):
+    # what MainFrame does before any window exists
+    t0 = time.perf_counter()
+    import calendar_backend
+    from todo_backend import get_task_manager
+    t1 = time.perf_counter()
+    cal_mgr = calendar_backend.CalendarManager(get_task_manager(path))
+    cal_mgr.load_timetable()
+    t2 = time.perf_counter()
+    print(f"imports:    {t1 - t0:.3f} s")
+    print(f"first load: {t2 - t1:.3f} s")
+    print(f"total:      {t2 - t0:.3f} s")
+
+
+BENCHES = {
+    "load": child_load,
+    "startup": child_startup,
+}
+
+
+def run(name, n):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.json")
+        make_store(path, n)
+        print(f"--- {name} ({n} tasks) ---", flush=True)
+        # chdir so module-level side effects can't touch the real store
+        subprocess.run(
+            [sys.executable, __file__, "--child", name, path],
+            cwd=tmp,
+            check=True
+        )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args and args[0] == "--child":
+        BENCHES[args[1]](args[2])
+    else:
+        name = args[0] if args else "load"
+        n = int(args[1]) if len(args) > 1 else 1_000_000
+        run(name, n)
@@ -1,18 +1,34 @@
 # calendar_backend.py
-import json
-from datetime import date, datetime
-from collections import defaultdict
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, timedelta
+from collections import defaultdict, OrderedDict
 
 from timetable_backend import (
+    DAYS,
     conflicts,
     timetable,
-    sort_timetable,
+    add_entry,
+    remove_entry,
+    replace_entry,
+    set_timetable,
+    read_entries,
+    bulk_add,
+    events_on,
+    weekday_name,
+    entry_days,
+    check_repeat,
+    shift_repeat,
+    occurs_on,
     find_class_index,
+    stored_entries,
+    timetable_version,
+    parse_time,
     validate_time
 )
 
 
 from todo_backend import TaskManager
+from storage_backend import read_json, write_json
 
 CATEGORY_COLORS_FILE = "category_colors.json"
 OVERRIDES_FILE = "timetable_overrides.json"
@@ -21,28 +37,36 @@ import os
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 TIMETABLE_FILE = os.path.join(BASE_DIR, "timetable.json")
 
+# dates kept by the daily_overview cache, a few months of clicking
+OVERVIEW_CACHE_SIZE = 256
+
+
+def _as_date(value):
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
 
 class CalendarManager:
     def __init__(self, task_manager: TaskManager):
         self.tm = task_manager
         self.category_colors = self._load_category_colors()
         self.overrides = self._load_overrides()
+        # sorted override dates, ISO strings sort chronologically
+        self.override_dates = sorted(self.overrides)
+        self.overrides_version = 0
+        self._overview_cache = OrderedDict()
 
     # -----------------------------
     # Category Colors
     # -----------------------------
     def _load_category_colors(self):
         try:
-            with open(CATEGORY_COLORS_FILE, "r") as f:
-                return json.load(f)
+            return read_json(CATEGORY_COLORS_FILE)
         except FileNotFoundError:
             return {}
 
     def save_category_color(self, category, color_hex):
         self.category_colors[category] = color_hex
-        json.dump(self.category_colors,
-                  open(CATEGORY_COLORS_FILE, "w"),
-                  indent=2)
+        write_json(CATEGORY_COLORS_FILE, self.category_colors, indent=2)
 
     def get_category_color(self, category):
         return self.category_colors.get(category, "#00E5FF")
@@ -52,15 +76,12 @@ class CalendarManager:
     # -----------------------------
     def _load_overrides(self):
         try:
-            with open(OVERRIDES_FILE, "r") as f:
-                return json.load(f)
+            return read_json(OVERRIDES_FILE)
         except FileNotFoundError:
             return {}
 
     def _save_overrides(self):
-        json.dump(self.overrides,
-                  open(OVERRIDES_FILE, "w"),
-                  indent=2)
+        write_json(OVERRIDES_FILE, self.overrides, indent=2)
 
     def override_event_for_date(
         self,
@@ -72,33 +93,94 @@ class CalendarManager:
         """
         Override a weekly event for a specific date
         """
-        if yyyy_mm_dd not in self.overrides:
-            self.overrides[yyyy_mm_dd] = {
-                "cancel": [],
-                "add": []
-            }
+        if not validate_time(new_start) or not validate_time(new_end):
+            raise ValueError("Invalid time format (HH:MM)")
+
+        # a second reschedule replaces the first one
+        previous = self._drop_added(yyyy_mm_dd, event_name)
+
+        category = previous.get("category", "General") if previous else "General"
+        for e in events_on(weekday_name(yyyy_mm_dd)):
+            if e["name"] == event_name:
+                category = e.get("category", "General")
+                break
+
+        override = self._override(yyyy_mm_dd)
 
         # cancel original
-        if event_name not in self.overrides[yyyy_mm_dd]["cancel"]:
-            self.overrides[yyyy_mm_dd]["cancel"].append(event_name)
+        if event_name not in override["cancel"]:
+            override["cancel"].append(event_name)
 
         # add modified event
-        self.overrides[yyyy_mm_dd]["add"].append({
+        override["add"].append({
             "name": event_name,
             "start": new_start,
-            "end": new_end
+            "end": new_end,
+            "category": category
         })
 
+        self.overrides_version += 1
         self._save_overrides()
 
+    def _override(self, yyyy_mm_dd):
+        # the date's override record, created on first use
+        if yyyy_mm_dd not in self.overrides:
+            self.overrides[yyyy_mm_dd] = {
+                "cancel": [],
+                "add": []
+            }
+            insort(self.override_dates, yyyy_mm_dd)
+        return self.overrides[yyyy_mm_dd]
+
+    def _drop_added(self, yyyy_mm_dd, event_name):
+        """
+        Remove the date's added copy of an event, return it (or None)
+        """
+        override = self.overrides.get(yyyy_mm_dd)
+        if not override:
+            return None
+        dropped = None
+        kept = []
+        for e in override.get("add", []):
+            if e["name"] == event_name:
+                dropped = e
+            else:
+                kept.append(e)
+        override["add"] = kept
+        if not kept and not override.get("cancel"):
+            del self.overrides[yyyy_mm_dd]
+            del self.override_dates[bisect_left(self.override_dates, yyyy_mm_dd)]
+        return dropped
+
+    def cancel_occurrence(self, yyyy_mm_dd, event_name):
+        """
+        Skip one date of a repeating event (an exception date), including
+        a rescheduled copy of it on that date
+        """
+        changed = self._drop_added(yyyy_mm_dd, event_name) is not None
+        override = self._override(yyyy_mm_dd)
+
+        if event_name not in override["cancel"]:
+            override["cancel"].append(event_name)
+            changed = True
+
+        if changed:
+            self.overrides_version += 1
+            self._save_overrides()
+
+    def overrides_between(self, start, end):
+        """
+        (date, override) pairs with start <= date <= end, in date order
+        """
+        lo = bisect_left(self.override_dates, start)
+        hi = bisect_right(self.override_dates, end)
+        return [(d, self.overrides[d]) for d in self.override_dates[lo:hi]]
+
     # -----------------------------
     # Tasks by Date
     # -----------------------------
     def tasks_for_date(self, yyyy_mm_dd):
-        return [
-            t for t in self.tm.tasks
-            if t.deadline == yyyy_mm_dd and not t.done
-        ]
+        return self.tm.filter_tasks(deadline=yyyy_mm_dd, done=False)
 
     # -----------------------------
     # Scheduling Tasks (weekly)
@@ -116,111 +198,246 @@ class CalendarManager:
         if conflicts(day_name, start, end):
             raise ValueError("Time conflict detected")
 
-        timetable.append({
+        add_entry({
             "name": f"Task: {task_title}",
             "day": day_name,
             "start": start,
             "end": end
         })
-        sort_timetable()
 
     # -----------------------------
     # Timetable for Specific Date (NEW)
     # -----------------------------
     def timetable_for_date(self, yyyy_mm_dd):
-        day_name = datetime.strptime(
-            yyyy_mm_dd, "%Y-%m-%d"
-        ).strftime("%A")
-
-        base_events = [
-            e for e in timetable
-            if e["day"] == day_name
-        ]
+        override = self.overrides.get(yyyy_mm_dd)
+        cancelled = set(override.get("cancel", ())) if override else ()
 
+        day = None
         final = []
-        for e in base_events:
+        for e in events_on(weekday_name(yyyy_mm_dd)):
+            if e["name"] in cancelled:
+                continue
+            if "repeat" in e:
+                if day is None:
+                    day = date.fromisoformat(yyyy_mm_dd)
+                if not occurs_on(e, day):
+                    continue
             final.append({
                 "date": yyyy_mm_dd,
                 "name": e["name"],
                 "start": e["start"],
                 "end": e["end"],
+                "start_min": e["start_min"],
+                "end_min": e["end_min"],
                 "category": e.get("category", "General")
             })
 
+        if override and override.get("add"):
+            for e in override["add"]:
+                # hand-edited overrides file: skip what can't be drawn
+                if not validate_time(e["start"]) or not validate_time(e["end"]):
+                    continue
+                final.append({
+                    "date": yyyy_mm_dd,
+                    "name": e["name"],
+                    "start": e["start"],
+                    "end": e["end"],
+                    "start_min": parse_time(e["start"]),
+                    "end_min": parse_time(e["end"]),
+                    "category": e.get("category", "General"),
+                    # lives in the overrides file, not the timetable
+                    "override": True
+                })
+            final.sort(key=lambda e: e["start_min"])
+
         return final
 
 
     # -----------------------------
     # Daily Overview
     # -----------------------------
+    def data_version(self):
+        """
+        Changes whenever tasks, the timetable or the overrides change
+        """
+        return (self.tm.version, timetable_version(), self.overrides_version)
+
     def daily_overview(self, yyyy_mm_dd):
-        return {
+        """
+        Cached per (date, data version); the result is shared, read only
+        """
+        key = (yyyy_mm_dd, self.data_version())
+        cache = self._overview_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+        result = {
             "tasks": self.tasks_for_date(yyyy_mm_dd),
             "events": self.timetable_for_date(yyyy_mm_dd)
         }
+        cache[key] = result
+        if len(cache) > OVERVIEW_CACHE_SIZE:
+            cache.popitem(last=False)
+        return result
 
     # -----------------------------
     # Upcoming Items
     # -----------------------------
     def upcoming_items(self, days=7):
         today = date.today()
+        last = today + timedelta(days=days)
         upcoming_tasks = []
-        upcoming_events = []
 
-        for t in self.tm.tasks:
-            if t.deadline:
-                d = datetime.strptime(t.deadline, "%Y-%m-%d").date()
-                if 0 <= (d - today).days <= days and not t.done:
-                    upcoming_tasks.append(t)
-
-        # upcoming events = weekly + overrides
-        for e in timetable:
-            upcoming_events.append(e)
+        for d, tasks in self.tm.tasks_between(
+            today.isoformat(), last.isoformat(), include_done=False
+        ):
+            upcoming_tasks.extend(tasks)
 
-        for day, data in self.overrides.items():
-            for ev in data.get("add", []):
-                upcoming_events.append(ev)
+        # concrete dated occurrences, rules and overrides applied
+        upcoming_events = list(self.iter_occurrences(today, last))
 
         return upcoming_tasks, upcoming_events
+
+    def iter_occurrences(self, start, end):
+        """
+        Lazily yield the events from start to end inclusive, one day at a
+        time, so a caller that stops early never expands the rest
+        """
+        d, end = _as_date(start), _as_date(end)
+        while d <= end:
+            yield from self.timetable_for_date(d.isoformat())
+            d += timedelta(days=1)
+
+    # -----------------------------
+    # Month Heatmap
+    # -----------------------------
+    def month_counts(self, year, month):
+        """
+        {day: (open tasks, events)} for one month in a single pass: tasks
+        from the deadline index, events from the weekday buckets. Only
+        repeat rules and override dates need a per-date look.
+        """
+        first = date(year, month, 1)
+        last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+
+        # per weekday: plain weekly entries counted once, rules kept aside
+        base = []
+        rules = []
+        for name in DAYS:
+            entries = events_on(name)
+            ruled = [e for e in entries if "repeat" in e]
+            base.append(len(entries) - len(ruled))
+            rules.append(ruled)
+
+        overridden = {
+            d for d, _ in self.overrides_between(first.isoformat(),
+                                                 last.isoformat())
+        }
+
+        counts = {}
+        d = first
+        while d <= last:
+            ds = d.isoformat()
+            if ds in overridden:
+                events = len(self.timetable_for_date(ds))
+            else:
+                wd = d.weekday()
+                events = base[wd] + sum(1 for e in rules[wd] if occurs_on(e, d))
+            counts[d.day] = (0, events)
+            d += timedelta(days=1)
+
+        for ds, tasks in self.tm.tasks_between(
+            first.isoformat(), last.isoformat(), include_done=False
+        ):
+            day = int(ds[8:])
+            counts[day] = (len(tasks), counts[day][1])
+
+        return counts
+
+    # -----------------------------
+    # Date Range (month / quarter views)
+    # -----------------------------
+    def range(self, start, end, include_done=False):
+        """
+        {date: {"tasks": [...], "events": [...]}} for every date from start
+        to end inclusive (dates or "YYYY-MM-DD"). Weekly events are expanded
+        to concrete dates with overrides applied; tasks come from the
+        sorted deadline index, so only due tasks are touched.
+        """
+        start, end = _as_date(start), _as_date(end)
+
+        days = {}
+        d = start
+        while d <= end:
+            ds = d.isoformat()
+            days[ds] = {"tasks": [], "events": self.timetable_for_date(ds)}
+            d += timedelta(days=1)
+
+        for ds, tasks in self.tm.tasks_between(
+            start.isoformat(), end.isoformat(), include_done=include_done
+        ):
+            days[ds]["tasks"] = tasks
+
+        return days
         # =============================
     # TIMETABLE ADAPTER (GUI SAFE)
     # =============================
 
-    def add_timetable_event(self, date, name, start, end, category):
-        from timetable_backend import timetable, conflicts, sort_timetable, validate_time
-        from datetime import datetime
-
-        day = datetime.strptime(date, "%Y-%m-%d").strftime("%A")
+    def add_timetable_event(self, date, name, start, end, category,
+                            repeat=None):
+        day = weekday_name(date)
 
         if not validate_time(start) or not validate_time(end):
             raise ValueError("Invalid time format (HH:MM)")
 
-        if conflicts(day, start, end):
-            raise ValueError("Timetable conflict detected")
-
-        timetable.append({
+        entry = {
             "name": name,
             "day": day,
             "start": start,
             "end": end,
             "category": category
-        })
+        }
+        if repeat:
+            # the picked date starts the series unless told otherwise
+            entry["repeat"] = check_repeat({"from": date, **repeat})
 
-        sort_timetable()
+        for d in entry_days(entry):
+            if conflicts(d, start, end, entry=entry):
+                raise ValueError("Timetable conflict detected")
+
+        add_entry(entry)
 
     
 
+    def import_timetable_events(self, path):
+        """
+        Bulk import from CSV/JSON; every problem is reported in one error
+        """
+        problems = bulk_add(read_entries(path))
+        if problems:
+            raise ValueError("\n".join(problems))
+
     def delete_timetable_event(self, event):
-        day = datetime.strptime(event["date"], "%Y-%m-%d").strftime("%A")
+        if event.get("override"):
+            # just this date's copy; the weekly event stays cancelled here
+            if self._drop_added(event["date"], event["name"]) is not None:
+                self.overrides_version += 1
+                self._save_overrides()
+            return
+
+        day = weekday_name(event["date"])
 
         idx = find_class_index(event["name"], day, event["start"])
         if idx is not None:
-            timetable.pop(idx)
+            remove_entry(idx)
 
     def update_timetable_event(self, old_event, new_event):
-        old_day = datetime.strptime(
-            old_event["date"], "%Y-%m-%d"
-        ).strftime("%A")
+        if old_event.get("override"):
+            self._update_added(old_event, new_event)
+            return
+
+        old_day = weekday_name(old_event["date"])
 
         idx = find_class_index(
             old_event["name"],
@@ -229,43 +446,67 @@ class CalendarManager:
         )
 
         if idx is None:
-            return
+            raise ValueError("Event not found")
 
-        new_day = datetime.strptime(
-            new_event["date"], "%Y-%m-%d"
-        ).strftime("%A")
-
-        if conflicts(
-            new_day,
-            new_event["start"],
-            new_event["end"],
-            ignore_index=idx
-        ):
-            raise ValueError("Timetable conflict detected")
+        new_day = weekday_name(new_event["date"])
 
-        timetable[idx] = {
+        entry = {
             "name": new_event["name"],
             "day": new_day,
             "start": new_event["start"],
             "end": new_event["end"],
             "category": new_event["category"]
         }
+        # editing one occurrence keeps the series' rule; moving it to
+        # another date moves the whole series by the same number of days
+        rule = timetable[idx].get("repeat")
+        if rule:
+            shift = (date.fromisoformat(new_event["date"])
+                     - date.fromisoformat(old_event["date"])).days
+            entry["repeat"] = shift_repeat(rule, shift) if shift else rule
+
+        for d in entry_days(entry):
+            if conflicts(
+                d,
+                new_event["start"],
+                new_event["end"],
+                ignore_index=idx,
+                entry=entry
+            ):
+                raise ValueError("Timetable conflict detected")
+
+        replace_entry(idx, entry)
+
+    def _update_added(self, old_event, new_event):
+        # an override copy moves within the overrides file only
+        if not validate_time(new_event["start"]) or not validate_time(new_event["end"]):
+            raise ValueError("Invalid time format (HH:MM)")
+        if self._drop_added(old_event["date"], old_event["name"]) is None:
+            raise ValueError("Event not found")
+
+        override = self._override(new_event["date"])
+        override["add"] = [
+            e for e in override["add"] if e["name"] != new_event["name"]
+        ]
+        override["add"].append({
+            "name": new_event["name"],
+            "start": new_event["start"],
+            "end": new_event["end"],
+            "category": new_event["category"]
+        })
 
-        sort_timetable()
+        self.overrides_version += 1
+        self._save_overrides()
 
     # -----------------------------
     # SAVE / LOAD (reuse backend)
     # -----------------------------
     def save_timetable(self):
-        with open(TIMETABLE_FILE, "w") as f:
-            json.dump(timetable, f, indent=2)
+        write_json(TIMETABLE_FILE, stored_entries(), indent=2)
 
     def load_timetable(self):
         try:
-            with open(TIMETABLE_FILE, "r") as f:
-                data = json.load(f)
-                timetable.clear()
-                timetable.extend(data)
-                sort_timetable()
+            data = read_json(TIMETABLE_FILE)
         except FileNotFoundError:
-            pass
+            return
+        set_timetable(data)
@@ -3,7 +3,7 @@ import wx.adv
 import calendar
 from datetime import date
 
-from todo_backend import TaskManager
+from todo_backend import get_task_manager
 from calendar_backend import CalendarManager
 
 # =============================
@@ -103,11 +103,14 @@ class StatCard(wx.Panel):
 # CALENDAR GRID (STABLE)
 # =============================
 class CalendarGrid(wx.Panel):
-    def __init__(self, parent, on_date_selected):
+    def __init__(self, parent, on_date_selected, cal_mgr=None):
         super().__init__(parent)
         self.SetBackgroundColour(PANEL)
 
         self.on_date_selected = on_date_selected
+        self.cal_mgr = cal_mgr
+        self._counts = {}
+        self._counts_key = None
 
         today = date.today()
         self.year = today.year
@@ -118,7 +121,7 @@ class CalendarGrid(wx.Panel):
         self.header = wx.BoxSizer(wx.HORIZONTAL)
 
         # IMPORTANT: FlexGridSizer (not GridSizer)
-        self.grid = wx.FlexGridSizer(rows=0, cols=8, vgap=4, hgap=4)
+        self.grid = wx.FlexGridSizer(rows=0, cols=7, vgap=4, hgap=4)
 
         self.build_header()
         self.build_grid()
@@ -143,6 +146,25 @@ class CalendarGrid(wx.Panel):
         date_str = f"{self.year}-{self.month:02d}-{self.selected_day:02d}"
         self.on_date_selected(date_str)
 
+    def counts_stale(self):
+        if self.cal_mgr is None:
+            return False
+        key = (self.year, self.month, self.cal_mgr.data_version())
+        return key != self._counts_key
+
+    def month_counts(self):
+        # one backend pass per month, redone only when the data changed
+        if self.counts_stale():
+            self._counts = self.cal_mgr.month_counts(self.year, self.month)
+            self._counts_key = (self.year, self.month,
+                                self.cal_mgr.data_version())
+        return self._counts
+
+    @staticmethod
+    def load_badge(tasks, events):
+        # "•" tasks due, "◦" events; exact numbers go in the tooltip
+        return ("•" if tasks else "") + ("◦" if events else "")
+
     # -------------------------
     # Header
     # -------------------------
@@ -181,41 +203,73 @@ class CalendarGrid(wx.Panel):
     # Grid
     # -------------------------
     def build_grid(self):
-        self.grid.Clear(True)
-
+        # created once: 7 headers and a fixed pool of 6x7 day cells that
+        # fill_grid relabels in place, so nothing is rebuilt or re-laid out
         for d in ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]:
             lbl = wx.StaticText(self, label=d)
             lbl.SetForegroundColour(SUBTEXT)
             self.grid.Add(lbl, 0, wx.ALIGN_CENTER)
 
-        for week in calendar.monthcalendar(self.year, self.month):
-            for d in week:
-                if d == 0:
-                    self.grid.Add(wx.Panel(self))
-                else:
-                    btn = wx.Button(self, label=str(d), size=(40, 40))
-                    btn.day = d
-                    btn.Bind(wx.EVT_BUTTON, self.on_day_clicked)
-
-                    if d == self.selected_day:
-                        btn.SetBackgroundColour(ACCENT)
-                        btn.SetForegroundColour("#000000")
-                    else:
-                        btn.SetBackgroundColour(PANEL)
-                        btn.SetForegroundColour(TEXT)
+        self.cells = []
+        for _ in range(6 * 7):
+            btn = wx.Button(self, label="", size=(44, 44))
+            btn.day = 0
+            btn.Bind(wx.EVT_BUTTON, self.on_day_clicked)
+            self.grid.Add(btn, 0, wx.ALIGN_CENTER)
+            self.cells.append(btn)
 
-                    self.grid.Add(btn, 0, wx.ALIGN_CENTER)
+        self.fill_grid()
 
-        self.grid.Layout()
-        self.root.Layout()
-        self.Layout()
+    def fill_grid(self):
+        self.clamp_day()
+        counts = self.month_counts()
+        days = [d for week in calendar.monthcalendar(self.year, self.month)
+                for d in week]
+        days += [0] * (len(self.cells) - len(days))
+
+        self._cell_of_day = {}
+        for btn, d in zip(self.cells, days):
+            btn.day = d
+            if d == 0:
+                btn.SetLabel("")
+                btn.UnsetToolTip()
+                btn.Disable()
+            else:
+                tasks, events = counts.get(d, (0, 0))
+                badge = self.load_badge(tasks, events)
+                btn.SetLabel(f"{d}\n{badge}" if badge else str(d))
+                if badge:
+                    btn.SetToolTip(f"{tasks} tasks, {events} events")
+                else:
+                    btn.UnsetToolTip()
+                btn.Enable()
+                self._cell_of_day[d] = btn
+            self.style_cell(btn)
+
+    def style_cell(self, btn):
+        if btn.day and btn.day == self.selected_day:
+            btn.SetBackgroundColour(ACCENT)
+            btn.SetForegroundColour("#000000")
+        else:
+            btn.SetBackgroundColour(PANEL)
+            btn.SetForegroundColour(TEXT)
+        btn.Refresh()
 
     # -------------------------
     # Events
     # -------------------------
     def on_day_clicked(self, evt):
+        old = self._cell_of_day.get(self.selected_day)
         self.selected_day = evt.GetEventObject().day
-        self.build_grid()
+
+        if self.counts_stale():
+            # data changed since the last fill: badges need relabelling
+            self.fill_grid()
+        else:
+            # only the old and new selection change look
+            if old is not None:
+                self.style_cell(old)
+            self.style_cell(self._cell_of_day[self.selected_day])
         self.emit_date()
 
     def prev_month(self, evt):
@@ -226,7 +280,7 @@ class CalendarGrid(wx.Panel):
             self.month -= 1
 
         self.month_lbl.SetLabel(f"{calendar.month_name[self.month]} {self.year}")
-        self.build_grid()
+        self.fill_grid()
         self.emit_date()
 
     def next_month(self, evt):
@@ -237,7 +291,7 @@ class CalendarGrid(wx.Panel):
             self.month += 1
 
         self.month_lbl.SetLabel(f"{calendar.month_name[self.month]} {self.year}")
-        self.build_grid()
+        self.fill_grid()
         self.emit_date()
 
 
@@ -313,7 +367,7 @@ class HomePage(wx.Panel):
 
         body = wx.BoxSizer(wx.HORIZONTAL)
 
-        self.calendar = CalendarGrid(self, self.on_date_selected)
+        self.calendar = CalendarGrid(self, self.on_date_selected, cal_mgr)
         body.Add(self.calendar, 0, wx.ALL, 20)
 
         stats = wx.BoxSizer(wx.VERTICAL)
@@ -459,7 +513,7 @@ class AddTaskDialog(wx.Dialog):
         category = self.cat_choice.GetStringSelection()
         priority = self.pr_choice.GetSelection()  # 0,1,2
 
-        self.cal_mgr.tm.add_task(
+        self.task = self.cal_mgr.tm.add_task(
             title=title,
             deadline=self.date_str,
             category=category,
@@ -469,49 +523,166 @@ class AddTaskDialog(wx.Dialog):
 
 
 # =============================
-# TASK ITEM
+# TASK LIST (VIRTUAL)
 # =============================
-class TaskItem(wx.Panel):
-    def __init__(self, parent, task, color, on_toggle, on_delete):
-        super().__init__(parent)
-        self.task = task
+class TaskListBox(wx.VListBox):
+    """
+    Custom-drawn task list: rows are ("header", category) or
+    ("task", task) tuples and only the visible ones are ever drawn.
+    """
+    HEADER_H = 40
+    ROW_H = 52          # 44 row + 8 gap
+    CHECK_X = 16
+    CHECK_SIZE = 18
+
+    def __init__(self, parent, on_toggle, on_delete):
+        super().__init__(parent, style=wx.BORDER_NONE)
+        self.SetBackgroundColour(BG)
         self.on_toggle = on_toggle
         self.on_delete = on_delete
+        self.rows = []
+        self.empty_text = ""
+        self._pos = None  # task -> row, rebuilt lazily after a shift
 
-        self.SetBackgroundColour(BG)
+        self.header_font = wx.Font(14, wx.FONTFAMILY_SWISS,
+                                   wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD)
+        self.title_font = wx.Font(10, wx.FONTFAMILY_SWISS,
+                                  wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL)
 
-        outer = wx.BoxSizer(wx.HORIZONTAL)
+        self.Bind(wx.EVT_LEFT_DOWN, self._on_left_down)
+        self.Bind(wx.EVT_RIGHT_DOWN, self._on_right_click)
+        self.Bind(wx.EVT_PAINT, self._on_paint)
+
+    def set_rows(self, rows, empty_text=""):
+        self.rows = rows
+        self.empty_text = empty_text
+        self._pos = None
+        self.SetItemCount(len(rows))
+        self.Refresh()
+
+    # ---------- Single-row patches ----------
+    def index_of(self, task):
+        if self._pos is None:
+            self._pos = {
+                value: n for n, (kind, value) in enumerate(self.rows)
+                if kind == "task"
+            }
+        return self._pos.get(task)
+
+    def group_of(self, n):
+        # category of the header above row n
+        while self.rows[n][0] != "header":
+            n -= 1
+        return self.rows[n][1]
+
+    def refresh_task(self, task):
+        n = self.index_of(task)
+        if n is not None:
+            self.RefreshRow(n)
+
+    def insert_task(self, task):
+        # end of its category group, where load_date would have put it
+        order = list(CATEGORIES)
+        rank = order.index(task.category)
+        n = 0
+        while n < len(self.rows):
+            kind, value = self.rows[n]
+            if kind == "header" and order.index(value) > rank:
+                break
+            n += 1
+        if not any(r == ("header", task.category) for r in self.rows):
+            self.rows.insert(n, ("header", task.category))
+            n += 1
+        self.rows.insert(n, ("task", task))
+        self._shifted()
+
+    def remove_task(self, task):
+        n = self.index_of(task)
+        if n is None:
+            return
+        del self.rows[n]
+        # drop the header too once its group is empty
+        after = self.rows[n][0] if n < len(self.rows) else "header"
+        if self.rows[n - 1][0] == "header" and after == "header":
+            del self.rows[n - 1]
+        self._shifted()
+
+    def _shifted(self):
+        self._pos = None
+        self.SetItemCount(len(self.rows))
+        self.Refresh()
+
+    # ---------- Drawing ----------
+    def OnMeasureItem(self, n):
+        return self.HEADER_H if self.rows[n][0] == "header" else self.ROW_H
+
+    def OnDrawBackground(self, dc, rect, n):
+        # no selection highlight, rows look like the old panels
+        dc.SetBrush(wx.Brush(BG))
+        dc.SetPen(wx.TRANSPARENT_PEN)
+        dc.DrawRectangle(rect)
 
-        bar = wx.Panel(self, size=(6, -1))
-        bar.SetBackgroundColour(color)
+    def OnDrawItem(self, dc, rect, n):
+        kind, value = self.rows[n]
 
-        chk = wx.CheckBox(self)
-        chk.SetValue(task.done)
-        chk.Bind(wx.EVT_CHECKBOX, self._toggle)
+        if kind == "header":
+            dc.SetFont(self.header_font)
+            dc.SetTextForeground(CATEGORIES[value])
+            dc.DrawText(value, rect.x + 12, rect.y + 14)
+            return
 
-        title = wx.StaticText(self, label=task.title)
-        title.SetForegroundColour(TEXT)
+        task = value
+        body = wx.Rect(rect.x, rect.y, rect.width, rect.height - 8)
 
-        outer.Add(bar, 0, wx.EXPAND)
-        outer.Add(chk, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 10)
-        outer.Add(title, 1, wx.ALIGN_CENTER_VERTICAL)
+        dc.SetBrush(wx.Brush(CATEGORIES[task.category]))
+        dc.DrawRectangle(body.x, body.y, 6, body.height)
 
-        self.SetSizer(outer)
-        self.SetMinSize((-1, 44))
+        box = wx.Rect(
+            body.x + self.CHECK_X,
+            body.y + (body.height - self.CHECK_SIZE) // 2,
+            self.CHECK_SIZE,
+            self.CHECK_SIZE
+        )
+        flags = wx.CONTROL_CHECKED if task.done else 0
+        wx.RendererNative.Get().DrawCheckBox(self, dc, box, flags)
 
-        # Right-click delete
-        self.Bind(wx.EVT_RIGHT_DOWN, self._on_right_click)
-        title.Bind(wx.EVT_RIGHT_DOWN, self._on_right_click)
-        chk.Bind(wx.EVT_RIGHT_DOWN, self._on_right_click)
+        dc.SetFont(self.title_font)
+        dc.SetTextForeground(TEXT)
+        th = dc.GetTextExtent(task.title)[1]
+        dc.DrawText(task.title, box.GetRight() + 12,
+                    body.y + (body.height - th) // 2)
+
+    def _on_paint(self, evt):
+        if self.rows:
+            evt.Skip()
+            return
+        dc = wx.PaintDC(self)
+        dc.SetBackground(wx.Brush(BG))
+        dc.Clear()
+        dc.SetTextForeground(SUBTEXT)
+        dc.DrawText(self.empty_text, 40, 40)
+
+    # ---------- Mouse ----------
+    def task_at(self, pos):
+        n = self.VirtualHitTest(pos.y)
+        if n == wx.NOT_FOUND or self.rows[n][0] != "task":
+            return None
+        return self.rows[n][1]
 
-    def _toggle(self, evt):
-        self.on_toggle(self.task)
+    def _on_left_down(self, evt):
+        task = self.task_at(evt.GetPosition())
+        # the checkbox column toggles, like clicking the old wx.CheckBox
+        if task is not None and evt.GetX() < self.CHECK_X + self.CHECK_SIZE + 12:
+            self.on_toggle(task)
 
     def _on_right_click(self, evt):
+        task = self.task_at(evt.GetPosition())
+        if task is None:
+            return
         menu = wx.Menu()
         delete_item = menu.Append(wx.ID_ANY, "Delete")
         self.Bind(wx.EVT_MENU,
-                  lambda e: self.on_delete(self.task),
+                  lambda e: self.on_delete(task),
                   delete_item)
         self.PopupMenu(menu)
         menu.Destroy()
@@ -520,6 +691,8 @@ class TaskItem(wx.Panel):
 # =============================
 # TODO PAGE
 # =============================
+SEARCH_DELAY_MS = 200
+
 class TodoPage(wx.Panel):
     def __init__(self, parent, cal_mgr):
         super().__init__(parent)
@@ -554,6 +727,10 @@ class TodoPage(wx.Panel):
         self.search = wx.SearchCtrl(self, size=(200, -1))
         self.search.Bind(wx.EVT_TEXT, self.on_search)
 
+        # typing restarts the timer; the list reloads once it goes quiet
+        self.search_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.apply_search, self.search_timer)
+
         add_btn = wx.StaticText(self, label="+")
         add_btn.SetForegroundColour(ACCENT)
         add_btn.SetFont(wx.Font(26, wx.FONTFAMILY_SWISS,
@@ -569,15 +746,10 @@ class TodoPage(wx.Panel):
 
         root.Add(header, 0, wx.EXPAND)
 
-        # ---------- Scroll ----------
-        self.scroll = wx.ScrolledWindow(self)
-        self.scroll.SetScrollRate(0, 20)
-        self.scroll.SetBackgroundColour(BG)
-
-        self.scroll_sizer = wx.BoxSizer(wx.VERTICAL)
-        self.scroll.SetSizer(self.scroll_sizer)
+        # ---------- List ----------
+        self.list = TaskListBox(self, self.toggle_done, self.delete_task)
 
-        root.Add(self.scroll, 1, wx.EXPAND | wx.LEFT | wx.RIGHT, 12)
+        root.Add(self.list, 1, wx.EXPAND | wx.LEFT | wx.RIGHT, 12)
         self.SetSizer(root)
 
         today = date.today().strftime("%Y-%m-%d")
@@ -616,6 +788,9 @@ class TodoPage(wx.Panel):
         self.load_date(self.date)
 
     def on_search(self, evt):
+        self.search_timer.StartOnce(SEARCH_DELAY_MS)
+
+    def apply_search(self, evt):
         self.search_text = self.search.GetValue().lower()
         self.load_date(self.date)
 
@@ -623,13 +798,44 @@ class TodoPage(wx.Panel):
     def on_add_task(self, evt):
         dlg = AddTaskDialog(self, self.cal_mgr, self.date)
         if dlg.ShowModal() == wx.ID_OK:
-            self.load_date(self.date)
+            self.patch_task(dlg.task)
         dlg.Destroy()
 
     def toggle_done(self, task):
-        task.done = not task.done
-        self.cal_mgr.tm.save()
-        self.load_date(self.date)
+        # go through the manager so the change reaches the journal
+        self.cal_mgr.tm.mark_by_id(task.id, not task.done)
+        self.patch_task(task)
+
+    def matches(self, task):
+        """
+        Whether one task passes the page's current date and filters
+        """
+        if task.deadline != self.date or task.category not in CATEGORIES:
+            return False
+        if self.status_filter == "active" and task.done:
+            return False
+        if self.status_filter == "completed" and not task.done:
+            return False
+        if (self.priority_filter != "all"
+                and task.priority != int(self.priority_filter)):
+            return False
+        return not self.search_text or self.search_text in task.title.lower()
+
+    def patch_task(self, task):
+        """
+        Bring one task's row up to date instead of reloading the page:
+        redraw it, move it to another category group, add or drop it
+        """
+        n = self.list.index_of(task)
+        wanted = self.matches(task)
+
+        if n is not None:
+            if wanted and self.list.group_of(n) == task.category:
+                self.list.refresh_task(task)
+                return
+            self.list.remove_task(task)
+        if wanted:
+            self.list.insert_task(task)
 
     def on_date_change(self, evt):
         d = evt.GetDate()
@@ -642,8 +848,6 @@ class TodoPage(wx.Panel):
         y, m, d = date_str.split("-")
         self.title.SetLabel(f"To-Do · {d}-{m}-{y}")
 
-        self.scroll_sizer.Clear(True)
-
         tasks = self.cal_mgr.tm.get_tasks_by_date(date_str)
 
         if self.status_filter == "active":
@@ -655,38 +859,21 @@ class TodoPage(wx.Panel):
             tasks = [t for t in tasks if t.priority == int(self.priority_filter)]
 
         if self.search_text:
-            tasks = [t for t in tasks if self.search_text in t.title.lower()]
+            tasks = self.cal_mgr.tm.search(self.search_text, within=tasks)
 
         grouped = {}
         for t in tasks:
             grouped.setdefault(t.category, []).append(t)
 
-        if not grouped:
-            msg = wx.StaticText(self.scroll, label="No tasks for this day.")
-            msg.SetForegroundColour(SUBTEXT)
-            self.scroll_sizer.Add(msg, 0, wx.ALL, 40)
-        else:
-            for cat in CATEGORIES:
-                if cat not in grouped:
-                    continue
-                hdr = wx.StaticText(self.scroll, label=cat)
-                hdr.SetForegroundColour(CATEGORIES[cat])
-                hdr.SetFont(wx.Font(14, wx.FONTFAMILY_SWISS,
-                                    wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
-                self.scroll_sizer.Add(hdr, 0, wx.LEFT | wx.TOP, 12)
-
-                for t in grouped[cat]:
-                    item = TaskItem(
-                    self.scroll,
-                    t,
-                    CATEGORIES[cat],
-                    self.toggle_done,
-                    self.delete_task
-                    )
-                    self.scroll_sizer.Add(item, 0, wx.EXPAND | wx.BOTTOM, 8)
-                    self.scroll.Layout()
-                    self.scroll.FitInside()
-                    self.scroll.Refresh()
+        # rows are only data; the list draws what is on screen
+        rows = []
+        for cat in CATEGORIES:
+            if cat not in grouped:
+                continue
+            rows.append(("header", cat))
+            rows.extend(("task", t) for t in grouped[cat])
+
+        self.list.set_rows(rows, "No tasks for this day.")
 
 
     def delete_task(self, task):
@@ -697,24 +884,21 @@ class TodoPage(wx.Panel):
             wx.YES_NO | wx.NO_DEFAULT | wx.ICON_WARNING
         )
         if dlg.ShowModal() == wx.ID_YES:
-            # SAFE delete (no IDs, no assumptions)
-            if task in self.cal_mgr.tm.tasks:
-                self.cal_mgr.tm.tasks.remove(task)
-                self.cal_mgr.tm.save()
-            self.load_date(self.date)
+            self.cal_mgr.tm.delete_by_id(task.id)
+            self.list.remove_task(task)
         dlg.Destroy()
 
 
-        self.scroll.Layout()
-        self.scroll.FitInside()
-
 # =============================
 # TIMETABLE PAGE (CANVAS BASED)
 # =============================
 import wx
 import wx.adv
+from bisect import bisect_right
 from datetime import datetime, timedelta, date
 
+from timetable_backend import assign_lanes
+
 DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday",
         "Friday", "Saturday", "Sunday"]
 
@@ -725,6 +909,25 @@ CATEGORY_COLOR_CACHE = {
     "College": (58, 134, 255)
 }
 
+# one brush per category, shared by every paint
+CATEGORY_BRUSHES = {}
+
+
+def category_brush(category):
+    brush = CATEGORY_BRUSHES.get(category)
+    if brush is None:
+        color = CATEGORY_COLOR_CACHE.get(category, (120, 120, 120))
+        brush = CATEGORY_BRUSHES[category] = wx.Brush(wx.Colour(*color))
+    return brush
+
+
+# label -> recurrence rule for add_timetable_event
+REPEAT_CHOICES = {
+    "Every week": None,
+    "Every 2 weeks": {"every": 2},
+    "Only this date": {"count": 1}
+}
+
 
 # =============================
 # TIMETABLE PAGE
@@ -775,6 +978,12 @@ class TimetableAddDialog(wx.Dialog):
         self.category.SetSelection(0)
         s.Add(self.category, 0, wx.EXPAND | wx.ALL, 6)
 
+        # Repeat
+        s.Add(wx.StaticText(panel, label="Repeat"), 0, wx.ALL, 6)
+        self.repeat = wx.Choice(panel, choices=list(REPEAT_CHOICES.keys()))
+        self.repeat.SetSelection(0)
+        s.Add(self.repeat, 0, wx.EXPAND | wx.ALL, 6)
+
         # Buttons — ✅ CORRECT PARENT
         btns = wx.StdDialogButtonSizer()
         btn_ok = wx.Button(panel, wx.ID_OK)
@@ -795,7 +1004,8 @@ class TimetableAddDialog(wx.Dialog):
             "date": f"{d.GetYear():04d}-{d.GetMonth()+1:02d}-{d.GetDay():02d}",
             "start": self.start.GetValue(),
             "end": self.end.GetValue(),
-            "category": self.category.GetStringSelection()
+            "category": self.category.GetStringSelection(),
+            "repeat": REPEAT_CHOICES[self.repeat.GetStringSelection()]
         }
 
 class TimetablePage(wx.Panel):
@@ -850,6 +1060,15 @@ class TimetablePage(wx.Panel):
         self.container = wx.BoxSizer(wx.VERTICAL)
         self.scroll.SetSizer(self.container)
 
+        # one canvas for the page's lifetime, retargeted by refresh()
+        self.canvas = TimelineCanvas(
+            self.scroll,
+            self.cal_mgr,
+            self.selected_date,
+            mode=self.view_mode
+        )
+        self.container.Add(self.canvas, 1, wx.EXPAND)
+
         root.Add(self.scroll, 1, wx.EXPAND | wx.LEFT | wx.RIGHT, 12)
         self.SetSizer(root)
 
@@ -883,22 +1102,65 @@ class TimetablePage(wx.Panel):
 
     # ---------- RENDER ----------
     def refresh(self):
-        self.container.Clear(True)
+        mode_changed = self.canvas.mode != self.view_mode
+        self.canvas.set_mode(self.view_mode)
+        self.canvas.set_date(self.selected_date)
+        self.canvas.sync()
 
-        canvas = TimelineCanvas(
-            self.scroll,
-            self.cal_mgr,
-            self.selected_date,
-            mode=self.view_mode
-        )
+        if mode_changed:
+            self.scroll.Layout()
+            self.scroll.FitInside()
 
-        self.container.Add(canvas, 1, wx.EXPAND)
-        self.scroll.Layout()
-        self.scroll.FitInside()
+
+# =============================
+# TIMELINE HIT TESTING
+# =============================
+class EventHitIndex:
+    """
+    Event rects per day column, sorted by top edge. max_bottoms[i] is the
+    lowest bottom among rects[0..i], so a point query bisects to the last
+    rect starting above the point and walks back only while something
+    earlier can still reach down to it. O(log n + k) for ordinary days;
+    a tall early event keeps the walk going, O(n) at worst.
+    """
+    def __init__(self, placed):
+        by_col = {}
+        for col, rect, ev in placed:
+            by_col.setdefault(col, []).append((rect, ev))
+
+        self.tops = {}
+        self.max_bottoms = {}
+        self.items = {}
+        for col, items in by_col.items():
+            items.sort(key=lambda item: item[0].y)  # stable: paint order kept
+            m = -1
+            bottoms = []
+            for rect, _ in items:
+                m = max(m, rect.y + rect.height)
+                bottoms.append(m)
+            self.tops[col] = [rect.y for rect, _ in items]
+            self.max_bottoms[col] = bottoms
+            self.items[col] = items
+
+    def hit(self, col, x, y):
+        """
+        (rect, event) at a logical point, topmost first, or None
+        """
+        if col not in self.items:
+            return None
+        items = self.items[col]
+        bottoms = self.max_bottoms[col]
+        j = bisect_right(self.tops[col], y) - 1
+        while j >= 0 and bottoms[j] > y:
+            rect, ev = items[j]
+            if rect.Contains((x, y)):
+                return rect, ev
+            j -= 1
+        return None
 
 
 # =============================
-# CANVAS TIMELINE (DISPLAY ONLY)
+# CANVAS TIMELINE
 # =============================
 class TimelineCanvas(wx.ScrolledWindow):
     Y_SCALE = 2
@@ -906,6 +1168,8 @@ class TimelineCanvas(wx.ScrolledWindow):
     COL_WIDTH = 150
     COL_GAP = 14
     TOP_PAD = 28
+    SNAP_MIN = 15       # drag granularity, minutes
+    EDGE = 6            # px at an event's bottom that start a resize
 
     def __init__(self, parent, cal_mgr, base_date, mode="weekly"):
         super().__init__(parent)
@@ -915,29 +1179,104 @@ class TimelineCanvas(wx.ScrolledWindow):
         self.base_date = base_date
         self.mode = mode
 
-        self._event_rects = []
+        self._placed = []
+        self._layout_key = None
+        self.hits = EventHitIndex([])
+        self._hover = None      # (rect, event) under the mouse
+        self._drag = None
+        self._grid_bmp = None
+        # timetable_for_date results for the shown days, per data version
+        self._events = {}
+        self._events_version = None
+        # date -> (event times, lanes) for the shown days; survives data
+        # changes on other days
+        self._lanes = {}
+        self._shown_key = None
+
+        # created once, not per paint or per event
+        self.header_font = wx.Font(10, wx.FONTFAMILY_SWISS,
+                                   wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD)
+        self.title_font = wx.Font(9, wx.FONTFAMILY_SWISS,
+                                  wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD)
+        self.time_font = wx.Font(8, wx.FONTFAMILY_SWISS,
+                                 wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL)
+        self.event_pen = wx.Pen(wx.Colour(80, 80, 80))
+        self.hover_pen = wx.Pen(wx.Colour(ACCENT), 2)
+        self.drag_pen = wx.Pen(wx.Colour(ACCENT), 2, wx.PENSTYLE_SHORT_DASH)
 
         self.Bind(wx.EVT_PAINT, self.on_paint)
+        self.Bind(wx.EVT_SIZE, self.on_size)
         self.Bind(wx.EVT_RIGHT_DOWN, self.on_right_click)
+        self.Bind(wx.EVT_MOTION, self.on_motion)
+        self.Bind(wx.EVT_LEAVE_WINDOW, self.on_leave)
+        self.Bind(wx.EVT_LEFT_DOWN, self.on_left_down)
+        self.Bind(wx.EVT_LEFT_UP, self.on_left_up)
+        self.Bind(wx.EVT_MOUSE_CAPTURE_LOST, self.on_capture_lost)
 
+        self.fit_mode()
+        self.SetScrollRate(0, 20)
+
+    def fit_mode(self):
         height = 24 * 60 * self.Y_SCALE + self.TOP_PAD * 2
-        cols = 7 if mode == "weekly" else 1
+        cols = 7 if self.mode == "weekly" else 1
         width = self.LEFT_MARGIN + cols * (self.COL_WIDTH + self.COL_GAP)
-
         self.SetVirtualSize((width, height))
-        self.SetScrollRate(0, 20)
 
-    def minutes(self, t):
-        h, m = map(int, t.split(":"))
-        return h * 60 + m
+    # ---------- Retargeting ----------
+    def set_mode(self, mode):
+        if mode == self.mode:
+            return
+        self.mode = mode
+        self._grid_bmp = None
+        self.fit_mode()
 
-    def on_paint(self, evt):
-        dc = wx.AutoBufferedPaintDC(self)
-        self.PrepareDC(dc)
-        dc.Clear()
+    def set_date(self, base_date):
+        if base_date == self.base_date:
+            return
+        if self.mode == "daily" and base_date.weekday() != self.base_date.weekday():
+            self._grid_bmp = None  # header shows the weekday
+        self.base_date = base_date
+
+    def sync(self):
+        """
+        Repaint if the shown days or the data changed since last time
+        """
+        key = (self.mode, self.days()[0], self.cal_mgr.data_version())
+        if key != self._shown_key:
+            self._shown_key = key
+            self.Refresh()
+
+    def events_for(self, d):
+        version = self.cal_mgr.data_version()
+        if version != self._events_version:
+            self._events.clear()
+            self._events_version = version
+        ds = d.isoformat()
+        events = self._events.get(ds)
+        if events is None:
+            events = self._events[ds] = self.cal_mgr.timetable_for_date(ds)
+        return events
+
+    def days(self):
+        if self.mode == "weekly":
+            monday = self.base_date - timedelta(days=self.base_date.weekday())
+            return [monday + timedelta(days=i) for i in range(7)]
+        return [self.base_date]
+
+    def on_size(self, evt):
+        self._grid_bmp = None
+        evt.Skip()
+
+    def grid_bitmap(self):
+        """
+        Background, hour grid and day headers, drawn once into a bitmap
+        """
+        if self._grid_bmp is not None:
+            return self._grid_bmp
 
-        self._event_rects.clear()
         w, h = self.GetVirtualSize()
+        bmp = wx.Bitmap(w, h)
+        dc = wx.MemoryDC(bmp)
 
         # Background
         dc.SetBrush(wx.Brush(BG))
@@ -946,68 +1285,255 @@ class TimelineCanvas(wx.ScrolledWindow):
 
         # Hour grid
         dc.SetTextForeground(SUBTEXT)
+        dc.SetPen(wx.Pen((60, 60, 60)))
         for hour in range(25):
             y = hour * 60 * self.Y_SCALE + self.TOP_PAD
             dc.DrawText(f"{hour:02d}:00", 8, y - 6)
-            dc.SetPen(wx.Pen((60, 60, 60)))
             dc.DrawLine(self.LEFT_MARGIN, y, w, y)
 
-        # Days
-        if self.mode == "weekly":
-            monday = self.base_date - timedelta(days=self.base_date.weekday())
-            days = [monday + timedelta(days=i) for i in range(7)]
-        else:
-            days = [self.base_date]
-
         # Day headers
-        dc.SetFont(wx.Font(10, wx.FONTFAMILY_SWISS,
-                           wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
+        dc.SetFont(self.header_font)
         dc.SetTextForeground(TEXT)
-        for i, d in enumerate(days):
+        for i, d in enumerate(self.days()):
             x = self.LEFT_MARGIN + i * (self.COL_WIDTH + self.COL_GAP)
-            dc.DrawText(d.strftime("%A"), x + 8, 6)
+            dc.DrawText(DAYS[d.weekday()], x + 8, 6)
+
+        dc.SelectObject(wx.NullBitmap)
+        self._grid_bmp = bmp
+        return bmp
+
+    def on_paint(self, evt):
+        dc = wx.AutoBufferedPaintDC(self)
+        self.PrepareDC(dc)
+
+        # only the exposed part, in logical (scrolled) coords
+        box = self.GetUpdateRegion().GetBox()
+        box.SetPosition(self.CalcUnscrolledPosition(box.GetPosition()))
+        dc.SetClippingRegion(box)
+
+        grid = wx.MemoryDC(self.grid_bitmap())
+        dc.Blit(box.x, box.y, box.width, box.height, grid, box.x, box.y)
+        grid.SelectObject(wx.NullBitmap)
 
         # Events
+        hover = self._hover[1] if self._hover else None
+        dc.SetTextForeground(wx.BLACK)
+        for col, rect, ev in self.layout():
+            if not rect.Intersects(box):
+                continue
+
+            dc.SetPen(self.hover_pen if ev is hover else self.event_pen)
+            dc.SetBrush(category_brush(ev.get("category", "General")))
+            dc.DrawRoundedRectangle(rect, 6)
+
+            dc.SetFont(self.title_font)
+            dc.DrawText(ev["name"][:min(20, max(3, rect.width // 7))],
+                        rect.x + 8, rect.y + 8)
+
+            dc.SetFont(self.time_font)
+            dc.DrawText(
+                f"{ev['start']} – {ev['end']}",
+                rect.x + 8,
+                rect.y + 26
+            )
+
+        # Drag outline
+        if self._drag is not None:
+            dc.SetPen(self.drag_pen)
+            dc.SetBrush(wx.TRANSPARENT_BRUSH)
+            dc.DrawRoundedRectangle(self._drag["preview"], 6)
+
+    def layout(self):
+        """
+        (column, rect, event) for every shown event, plus the hit index
+        over them; redone only when the shown days or the data change
+        """
+        key = (self.mode, self.days()[0], self.cal_mgr.data_version())
+        if key == self._layout_key:
+            return self._placed
+
+        days = self.days()
+        # lanes are kept for the shown days only
+        for d in [d for d in self._lanes if d not in days]:
+            del self._lanes[d]
+        shown = {d.isoformat() for d in days}
+        for ds in [ds for ds in self._events if ds not in shown]:
+            del self._events[ds]
+
+        placed = []
         for i, d in enumerate(days):
             x = self.LEFT_MARGIN + i * (self.COL_WIDTH + self.COL_GAP)
-            events = self.cal_mgr.timetable_for_date(d.strftime("%Y-%m-%d"))
-
-            for ev in events:
-                try:
-                    s = self.minutes(ev["start"])
-                    e = self.minutes(ev["end"])
-                except Exception:
-                    continue
+            events = self.events_for(d)
+            for ev, (lane, lanes) in zip(events, self.day_lanes(d, events)):
+                s = ev["start_min"]
+                e = ev["end_min"]
 
                 y = s * self.Y_SCALE + self.TOP_PAD
                 duration = max(15, e - s)          # minimum 15 minutes
                 h_e = duration * self.Y_SCALE
 
+                # overlapping events split the column side by side
+                w = self.COL_WIDTH // lanes
+                rect = wx.Rect(x + lane * w, y, w - (2 if lanes > 1 else 0), h_e)
+                placed.append((i, rect, ev))
+
+        self._placed = placed
+        self.hits = EventHitIndex(placed)
+        self._layout_key = key
+        self._hover = None
+        return placed
+
+    def day_lanes(self, d, events):
+        """
+        Sub-column per event, recomputed only if that day's times changed
+        """
+        # drawn extent, so events stretched to 15 minutes count as overlapping
+        times = tuple(
+            (ev["start_min"], ev["start_min"] + max(15, ev["end_min"] - ev["start_min"]))
+            for ev in events
+        )
+        cached = self._lanes.get(d)
+        if cached is None or cached[0] != times:
+            cached = self._lanes[d] = (times, assign_lanes(times))
+        return cached[1]
+
+    # ---------- HIT TESTING ----------
+    def column_at(self, lx):
+        col, off = divmod(lx - self.LEFT_MARGIN, self.COL_WIDTH + self.COL_GAP)
+        if lx < self.LEFT_MARGIN or col >= len(self.days()) or off > self.COL_WIDTH:
+            return None
+        return col
+
+    def hit_test(self, lx, ly):
+        col = self.column_at(lx)
+        if col is None:
+            return None
+        self.layout()
+        return self.hits.hit(col, lx, ly)
+
+    def refresh_logical(self, rect):
+        x, y = self.CalcScrolledPosition(rect.x, rect.y)
+        self.RefreshRect(wx.Rect(x - 2, y - 2, rect.width + 4, rect.height + 4))
+
+    def minute_at(self, y):
+        # snapped to SNAP_MIN, kept inside the day
+        m = (y - self.TOP_PAD) / self.Y_SCALE
+        m = int(round(m / self.SNAP_MIN)) * self.SNAP_MIN
+        return min(max(m, 0), 24 * 60 - 1)
+
+    # ---------- HOVER / TOOLTIP ----------
+    def on_motion(self, evt):
+        lx, ly = self.CalcUnscrolledPosition(evt.GetPosition())
+        if self._drag is not None:
+            self.drag_to(lx, ly)
+            return
 
-                rect = wx.Rect(x, y, self.COL_WIDTH, h_e)
-                self._event_rects.append((rect, ev))
+        hit = self.hit_test(lx, ly)
+        if (hit and hit[1]) is not (self._hover and self._hover[1]):
+            self.set_hover(hit)
 
-                color = CATEGORY_COLOR_CACHE.get(ev.get("category", "General"), (120, 120, 120))
-                dc.SetBrush(wx.Brush(wx.Colour(*color)))
-                dc.SetPen(wx.Pen(wx.Colour(80, 80, 80)))
-                dc.DrawRoundedRectangle(rect, 6)
+        if hit and ly >= hit[0].GetBottom() - self.EDGE:
+            self.SetCursor(wx.Cursor(wx.CURSOR_SIZENS))
+        elif hit:
+            self.SetCursor(wx.Cursor(wx.CURSOR_HAND))
+        else:
+            self.SetCursor(wx.NullCursor)
+
+    def set_hover(self, hit):
+        old = self._hover
+        self._hover = hit
+        for h in (old, hit):
+            if h:
+                self.refresh_logical(h[0])
+        if hit:
+            ev = hit[1]
+            self.SetToolTip(f"{ev['name']}\n{ev['start']} – {ev['end']}")
+        else:
+            self.UnsetToolTip()
+
+    def on_leave(self, evt):
+        if self._drag is None and self._hover:
+            self.set_hover(None)
+
+    # ---------- DRAG TO MOVE / RESIZE ----------
+    def on_left_down(self, evt):
+        lx, ly = self.CalcUnscrolledPosition(evt.GetPosition())
+        hit = self.hit_test(lx, ly)
+        if hit is None:
+            evt.Skip()
+            return
+        rect, ev = hit
+        self._drag = {
+            "event": ev,
+            "rect": rect,
+            "resize": ly >= rect.GetBottom() - self.EDGE,
+            "dy": ly - rect.y,
+            "preview": wx.Rect(rect)
+        }
+        self.CaptureMouse()
 
-                dc.SetTextForeground(wx.BLACK)
-                dc.SetFont(wx.Font(9, wx.FONTFAMILY_SWISS,
-                                   wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
-                dc.DrawText(ev["name"][:20], rect.x + 8, rect.y + 8)
-
-                dc.SetFont(wx.Font(
-                    8,
-                    wx.FONTFAMILY_SWISS,
-                    wx.FONTSTYLE_NORMAL,
-                    wx.FONTWEIGHT_NORMAL
-                ))
-                dc.DrawText(
-                    f"{ev['start']} – {ev['end']}",
-                    rect.x + 8,
-                    rect.y + 26
-                )
+    def drag_to(self, lx, ly):
+        drag = self._drag
+        rect = drag["rect"]
+        old = drag["preview"]
+
+        if drag["resize"]:
+            bottom = self.minute_at(ly) * self.Y_SCALE + self.TOP_PAD
+            height = max(self.SNAP_MIN * self.Y_SCALE, bottom - rect.y)
+            preview = wx.Rect(rect.x, rect.y, rect.width, height)
+        else:
+            step = self.COL_WIDTH + self.COL_GAP
+            col = (lx - self.LEFT_MARGIN) // step
+            col = min(max(col, 0), len(self.days()) - 1)
+            x = rect.x + (col - (rect.x - self.LEFT_MARGIN) // step) * step
+            top = self.minute_at(ly - drag["dy"]) * self.Y_SCALE + self.TOP_PAD
+            preview = wx.Rect(x, top, rect.width, rect.height)
+
+        drag["preview"] = preview
+        self.refresh_logical(old)
+        self.refresh_logical(preview)
+
+    def on_left_up(self, evt):
+        drag = self._drag
+        if drag is None:
+            evt.Skip()
+            return
+        self._drag = None
+        if self.HasCapture():
+            self.ReleaseMouse()
+        self.refresh_logical(drag["preview"])
+
+        ev = drag["event"]
+        preview = drag["preview"]
+        if preview == drag["rect"]:
+            return
+
+        col = (preview.x - self.LEFT_MARGIN) // (self.COL_WIDTH + self.COL_GAP)
+        start = (preview.y - self.TOP_PAD) // self.Y_SCALE
+        if drag["resize"]:
+            end = start + preview.height // self.Y_SCALE
+        else:
+            end = start + ev["end_min"] - ev["start_min"]
+        end = min(end, 24 * 60 - 1)
+        if end <= start:
+            return
+
+        new_event = dict(ev)
+        new_event["date"] = self.days()[col].isoformat()
+        new_event["start"] = f"{start // 60:02d}:{start % 60:02d}"
+        new_event["end"] = f"{end // 60:02d}:{end % 60:02d}"
+
+        try:
+            self.cal_mgr.update_timetable_event(ev, new_event)
+            self.cal_mgr.save_timetable()
+        except ValueError as e:
+            wx.MessageBox(str(e), "Error", wx.ICON_WARNING)
+        self.GetParent().GetParent().refresh()
+
+    def on_capture_lost(self, evt):
+        if self._drag is not None:
+            self.refresh_logical(self._drag["preview"])
+            self._drag = None
 
     # ---------- RIGHT CLICK DELETE ----------
     def on_right_click(self, evt):
@@ -1015,22 +1541,35 @@ class TimelineCanvas(wx.ScrolledWindow):
         mx, my = evt.GetPosition()
         lx, ly = self.CalcUnscrolledPosition(mx, my)
 
-        for rect, ev in self._event_rects:
-            if rect.Contains((lx, ly)):
-                menu = wx.Menu()
-                item_delete = menu.Append(wx.ID_ANY, "Delete")
+        hit = self.hit_test(lx, ly)
+        if hit is None:
+            return
+        rect, ev = hit
+
+        menu = wx.Menu()
+        item_skip = menu.Append(wx.ID_ANY, "Skip This Date")
+        item_delete = menu.Append(wx.ID_ANY, "Delete")
 
-                # bind to menu (correct)
-                menu.Bind(
-                    wx.EVT_MENU,
-                    lambda e, ev=ev: self.delete_event(ev),
-                    item_delete
-                )
+        menu.Bind(
+            wx.EVT_MENU,
+            lambda e, ev=ev: self.skip_event(ev),
+            item_skip
+        )
+
+        # bind to menu (correct)
+        menu.Bind(
+            wx.EVT_MENU,
+            lambda e, ev=ev: self.delete_event(ev),
+            item_delete
+        )
+
+        self.PopupMenu(menu)
+        menu.Destroy()
 
-                self.PopupMenu(menu)
-                menu.Destroy()
-                return
 
+    def skip_event(self, event):
+        self.cal_mgr.cancel_occurrence(event["date"], event["name"])
+        self.GetParent().GetParent().refresh()
 
     def delete_event(self, event):
         if wx.MessageBox(
@@ -1050,8 +1589,7 @@ class MainFrame(wx.Frame):
         super().__init__(None, title="Executive Planner", size=(1200, 800))
         self.SetBackgroundColour(BG)
 
-        tm = TaskManager()
-        self.cal_mgr = CalendarManager(tm)
+        self.cal_mgr = CalendarManager(get_task_manager())
 
         # ✅ LOAD TIMETABLE AT STARTUP
         self.cal_mgr.load_timetable()
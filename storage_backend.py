@@ -0,0 +1,505 @@
+# storage_backend.py
+import json
+import os
+import re
+import sqlite3
+
+# optional fast codecs, stdlib json is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# what a torn or corrupt record raises, per codec
+DECODE_ERRORS = (ValueError,) + ((msgspec.DecodeError,) if msgspec else ())
+
+# Journal is folded back into the snapshot once it grows past this size
+JOURNAL_COMPACT_BYTES = 256 * 1024
+
+# Snapshots larger than this are parsed task by task
+STREAM_BYTES = 32 * 1024 * 1024
+
+
+# --------------------------
+# JSON Codec
+# --------------------------
+def dumps(data, indent=None):
+    """
+    Encode to bytes. Compact unless an indent is asked for.
+    """
+    if indent is None:
+        if orjson is not None:
+            return orjson.dumps(data)
+        if msgspec is not None:
+            return msgspec.json.encode(data)
+        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return json.dumps(data, indent=indent).encode("utf-8")
+
+
+def loads(raw):
+    if orjson is not None:
+        return orjson.loads(raw)
+    if msgspec is not None:
+        return msgspec.json.decode(raw)
+    return json.loads(raw)
+
+
+def read_json(path):
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def write_json(path, data, indent=None):
+    """
+    Write to a temp file and rename it over the target, so a crash mid-save
+    leaves the previous file intact instead of a truncated one.
+    """
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(dumps(data, indent))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+_WS = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    """
+    Incremental reader over a text file for stream_store
+    """
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def more(self):
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        # next non-whitespace character, "" at end of file
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.more():
+                return ""
+
+    def expect(self, ch):
+        if self.peek() != ch:
+            raise ValueError(f"Expected {ch!r} at offset {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.more():
+                    continue
+                raise
+            # a number cut at the chunk edge decodes "fine", read on first
+            if end == len(self.buf) and not self.eof and self.more():
+                continue
+            self.pos = end
+            return obj
+
+
+def stream_store(path, meta, chunk_size=1 << 16):
+    """
+    Yield the task dicts of a store file one at a time instead of building
+    the whole list. The other top-level keys are put into meta as they are
+    passed, so meta is complete once the generator is exhausted.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        r = _Reader(f, chunk_size)
+        r.expect("{")
+        if r.peek() == "}":
+            return
+        while True:
+            key = r.value()
+            r.expect(":")
+            if key == "tasks":
+                r.expect("[")
+                if r.peek() == "]":
+                    r.pos += 1
+                else:
+                    while True:
+                        yield r.value()
+                        if r.peek() == "]":
+                            r.pos += 1
+                            break
+                        r.expect(",")
+            else:
+                meta[key] = r.value()
+
+            if r.peek() == "}":
+                return
+            r.expect(",")
+
+
+# --------------------------
+# Snapshot Storage (default)
+# --------------------------
+class JsonStorage:
+    """
+    Keeps the whole store in one JSON file and rewrites it on every change
+    """
+    def __init__(self, filename):
+        self.filename = filename
+
+    def load(self):
+        # big stores are streamed: "tasks" is then a one-shot iterator and
+        # the other keys are only filled in once it has been consumed
+        if os.path.getsize(self.filename) < STREAM_BYTES:
+            return self.read_snapshot()
+        data = {}
+        data["tasks"] = stream_store(self.filename, data)
+        return data
+
+    def read_snapshot(self):
+        return read_json(self.filename)
+
+    def save(self, data):
+        write_json(self.filename, data)
+
+    def record(self, op, task, fields, snapshot):
+        # no journal: every mutation is a full rewrite
+        self.save(snapshot())
+
+    def bind(self, tasks):
+        # only needed by stores that map rows back to Task objects
+        pass
+
+    def query(self, filters):
+        # None = cannot answer, caller scans the list itself
+        return None
+
+
+# --------------------------
+# Journal Storage
+# --------------------------
+class JournalStorage(JsonStorage):
+    """
+    Appends one JSON line per mutation to <filename>.journal and only
+    rewrites the snapshot when the journal is compacted.
+
+    Every record carries a sequence number and the snapshot stores the last
+    one it contains, so a crash between writing the snapshot and truncating
+    the journal never replays a record twice.
+    """
+    def __init__(self, filename, compact_bytes=JOURNAL_COMPACT_BYTES):
+        super().__init__(filename)
+        self.journal_file = filename + ".journal"
+        self.compact_bytes = compact_bytes
+        self.seq = 0
+        self._journal = None
+
+    def load(self):
+        try:
+            data = self.read_snapshot()
+        except FileNotFoundError:
+            if not os.path.exists(self.journal_file):
+                raise
+            data = {"tasks": []}
+
+        records, torn = self._read_journal()
+        self.seq = data.get("seq", 0)
+        records = [r for r in records if r["seq"] > self.seq]
+        replay(data, records)
+        if records:
+            self.seq = records[-1]["seq"]
+
+        data["seq"] = self.seq
+        # rewrite a torn journal so new records don't land after the tear
+        if torn or self._journal_size() >= self.compact_bytes:
+            self.save(data)
+        return data
+
+    def save(self, data):
+        # compaction: snapshot first, then drop the records it now holds
+        data["seq"] = self.seq
+        super().save(data)
+        self._close_journal()
+        open(self.journal_file, "w").close()
+
+    def record(self, op, task, fields, snapshot):
+        # a reorder touches every position, cheaper to snapshot once
+        if op == "sort":
+            self.save(snapshot())
+            return
+
+        self.seq += 1
+        rec = {"seq": self.seq, "op": op}
+        rec.update(fields)
+
+        if self._journal is None:
+            self._journal = open(self.journal_file, "ab")
+        self._journal.write(dumps(rec) + b"\n")
+        self._journal.flush()
+
+        if self._journal.tell() >= self.compact_bytes:
+            self.save(snapshot())
+
+    def _read_journal(self):
+        try:
+            with open(self.journal_file, "rb") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return [], False
+
+        records = []
+        for line in lines:
+            try:
+                records.append(loads(line))
+            except DECODE_ERRORS:
+                # torn write from a crash: nothing after it was committed
+                return records, True
+        return records, False
+
+    def _journal_size(self):
+        try:
+            return os.path.getsize(self.journal_file)
+        except OSError:
+            return 0
+
+    def _close_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+
+def replay(data, records):
+    """
+    Apply journal records to raw snapshot data, addressing tasks by id
+    """
+    tasks = data.setdefault("tasks", [])
+    by_id = {t.get("id"): t for t in tasks}
+    removed = set()
+
+    for rec in records:
+        op = rec["op"]
+        if op == "add":
+            tasks.append(rec["task"])
+            by_id[rec["task"]["id"]] = rec["task"]
+            continue
+
+        # records for tasks the snapshot no longer has are skipped
+        task = by_id.get(rec["id"])
+        if task is None:
+            continue
+        if op == "delete":
+            removed.add(id(by_id.pop(rec["id"])))
+        elif op == "edit":
+            task.update(rec["updates"])
+        elif op == "mark":
+            task["done"] = rec["done"]
+            data["streak"] = rec["streak"]
+            data["last_done_date"] = rec["last_done_date"]
+
+    # drop deleted tasks in one pass instead of a list.remove per record
+    if removed:
+        data["tasks"] = [t for t in tasks if id(t) not in removed]
+
+
+# --------------------------
+# SQLite Storage
+# --------------------------
+TASK_COLUMNS = ("id", "title", "deadline", "priority", "category", "done",
+                "created_at")
+PLACEHOLDERS = ", ".join("?" for _ in TASK_COLUMNS)
+
+
+class SqliteStorage(JsonStorage):
+    """
+    Keeps tasks in <name>.db with indexes on the filter columns, so
+    filter_tasks / get_tasks_by_date are answered by SQL instead of a scan.
+
+    List order is rowid order. The store maps rowids to the manager's Task
+    objects so query results are the same objects the GUI holds.
+    """
+    def __init__(self, filename):
+        super().__init__(filename)
+        self.db_file = os.path.splitext(filename)[0] + ".db"
+        self.tasks = []
+        self._rowids = []
+        self._rowid_of = {}
+        self._task_at = {}
+        self.conn = None
+
+    def _connect(self):
+        self.conn = sqlite3.connect(self.db_file)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id TEXT,
+                title TEXT,
+                deadline TEXT,
+                priority,
+                category TEXT,
+                done INTEGER,
+                created_at TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_tasks_deadline ON tasks(deadline);
+            CREATE INDEX IF NOT EXISTS idx_tasks_category ON tasks(category);
+            CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority);
+            CREATE INDEX IF NOT EXISTS idx_tasks_done ON tasks(done);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value
+            );
+        """)
+
+        # stores created before tasks had ids
+        cols = [r[1] for r in self.conn.execute("PRAGMA table_info(tasks)")]
+        if "id" not in cols:
+            self.conn.execute("ALTER TABLE tasks ADD COLUMN id TEXT")
+        self.conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_id ON tasks(id)"
+        )
+
+    def load(self):
+        is_new = not os.path.exists(self.db_file)
+        if self.conn is None:
+            self._connect()
+
+        if is_new:
+            # first run: import the existing JSON store if there is one
+            data = self.read_snapshot()
+            self.save(data)
+            return data
+
+        cols = ", ".join(TASK_COLUMNS)
+        rows = self.conn.execute(f"SELECT rowid, {cols} FROM tasks ORDER BY rowid")
+        tasks = []
+        self._rowids = []
+        for row in rows:
+            self._rowids.append(row[0])
+            t = dict(zip(TASK_COLUMNS, row[1:]))
+            t["done"] = bool(t["done"])
+            tasks.append(t)
+
+        meta = dict(self.conn.execute("SELECT key, value FROM meta"))
+        return {
+            "tasks": tasks,
+            "streak": meta.get("streak", 0),
+            "last_done_date": meta.get("last_done_date")
+        }
+
+    def save(self, data):
+        if self.conn is None:
+            self._connect()
+
+        rows = [
+            (i, *(t.get(c) for c in TASK_COLUMNS))
+            for i, t in enumerate(data.get("tasks", []), 1)
+        ]
+        with self.conn:
+            self.conn.execute("DELETE FROM tasks")
+            self.conn.executemany(
+                f"INSERT INTO tasks (rowid, {', '.join(TASK_COLUMNS)}) "
+                f"VALUES (?, {PLACEHOLDERS})",
+                rows
+            )
+            self._save_meta(data.get("streak", 0), data.get("last_done_date"))
+        self._rowids = [r[0] for r in rows]
+        self.bind(self.tasks)
+
+    def bind(self, tasks):
+        # pair rows with Task objects positionally (both are in list order)
+        self.tasks = tasks
+        if len(self._rowids) != len(tasks):
+            return
+        self._rowid_of = {t: r for t, r in zip(tasks, self._rowids)}
+        self._task_at = {r: t for t, r in zip(tasks, self._rowids)}
+
+    def record(self, op, task, fields, snapshot):
+        if op == "sort":
+            self.save(snapshot())
+            return
+
+        with self.conn:
+            if op == "add":
+                d = fields["task"]
+                cur = self.conn.execute(
+                    f"INSERT INTO tasks ({', '.join(TASK_COLUMNS)}) "
+                    f"VALUES ({PLACEHOLDERS})",
+                    [d[c] for c in TASK_COLUMNS]
+                )
+                self._rowid_of[task] = cur.lastrowid
+                self._task_at[cur.lastrowid] = task
+            elif op == "delete":
+                rowid = self._rowid_of.pop(task)
+                del self._task_at[rowid]
+                self.conn.execute("DELETE FROM tasks WHERE rowid = ?", (rowid,))
+            elif op == "edit":
+                updates = {k: v for k, v in fields["updates"].items()
+                           if k in TASK_COLUMNS}
+                if updates:
+                    sets = ", ".join(f"{k} = ?" for k in updates)
+                    self.conn.execute(
+                        f"UPDATE tasks SET {sets} WHERE rowid = ?",
+                        [*updates.values(), self._rowid_of[task]]
+                    )
+            elif op == "mark":
+                self.conn.execute(
+                    "UPDATE tasks SET done = ? WHERE rowid = ?",
+                    (fields["done"], self._rowid_of[task])
+                )
+                self._save_meta(fields["streak"], fields["last_done_date"])
+
+    def query(self, filters):
+        if any(k not in TASK_COLUMNS for k in filters):
+            return None
+
+        where = []
+        params = []
+        for key, value in filters.items():
+            if value is None:
+                where.append(f"{key} IS NULL")
+            else:
+                where.append(f"{key} = ?")
+                params.append(value)
+
+        sql = "SELECT rowid FROM tasks"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY rowid"
+        return [self._task_at[r] for (r,) in self.conn.execute(sql, params)]
+
+    def _save_meta(self, streak, last_done_date):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [("streak", streak), ("last_done_date", last_done_date)]
+        )
+
+
+STORAGES = {
+    "json": JsonStorage,
+    "journal": JournalStorage,
+    "sqlite": SqliteStorage,
+}
+
+
+def make_storage(kind, filename):
+    try:
+        return STORAGES[kind](filename)
+    except KeyError:
+        raise ValueError(f"Unknown storage: {kind}")
@@ -1,5 +1,10 @@
+import csv
+import heapq
 import json
-from datetime import datetime
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from math import gcd
 
 DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
 DAY_TO_INDEX = {d: i for i, d in enumerate(DAYS)}
@@ -18,24 +23,486 @@ def validate_time(t):
     except:
         return False
 
+# Entries carry their times as minute ints too, filled in once when they
+# enter the timetable; everything past that point reads the ints only.
+# They are derived data, so save through stored_entries().
+CACHED_FIELDS = ("start_min", "end_min")
+
+def prepare_entry(cls):
+    if not validate_time(cls["start"]) or not validate_time(cls["end"]):
+        raise ValueError(f"Invalid time format (HH:MM) in {cls.get('name')!r}")
+    if cls.get("repeat"):
+        # loaded and imported rules get the same checks as typed ones
+        cls["repeat"] = check_repeat(cls["repeat"])
+    cls["start_min"] = parse_time(cls["start"])
+    cls["end_min"] = parse_time(cls["end"])
+    return cls
+
+def stored_entries(entries=None):
+    """
+    Entries as they go to disk, without the cached minute fields
+    """
+    return [
+        {k: v for k, v in cls.items() if k not in CACHED_FIELDS}
+        for cls in (timetable if entries is None else entries)
+    ]
+
+# timetable stays sorted by (day index, start minute); _keys holds that
+# key for each entry so inserts can bisect instead of re-sorting
+_keys = []
+
+def entry_key(cls):
+    return (DAY_TO_INDEX[cls["day"]], cls["start_min"])
+
 def sort_timetable():
-    timetable.sort(key=lambda x: (DAY_TO_INDEX[x["day"]], parse_time(x["start"])))
-
-def conflicts(day, start, end, ignore_index=None):
-    s, e = parse_time(start), parse_time(end)
-    for idx, cls in enumerate(timetable):
-        if ignore_index is not None and idx == ignore_index:
-            continue
-        if cls["day"] == day:
-            cs, ce = parse_time(cls["start"]), parse_time(cls["end"])
-            if not (e <= cs or ce <= s):
+    keyed = sorted(((entry_key(cls), cls) for cls in timetable),
+                   key=lambda x: x[0])
+    _keys[:] = [k for k, _ in keyed]
+    timetable[:] = [cls for _, cls in keyed]
+
+# --------------------------
+# Per-day interval index
+# --------------------------
+class DayIndex:
+    """
+    One day's entries sorted by start, with start/end kept as minute ints.
+    max_ends[i] is the latest end among entries[0..i], so an overlap query
+    can stop walking back as soon as nothing earlier reaches the window.
+    That is O(log n + k) when entries are short, but it degrades to O(n):
+    one long early entry (00:00-23:00) keeps every max_end above the
+    window, so the walk visits every earlier entry. Fine for a day's
+    handful of classes; not an interval tree.
+    """
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.max_ends = []
+        self.entries = []
+
+    def add(self, entry):
+        s, e = entry["start_min"], entry["end_min"]
+        i = bisect_right(self.starts, s)
+        self.starts.insert(i, s)
+        self.ends.insert(i, e)
+        self.entries.insert(i, entry)
+        self._fix_max_ends(i)
+
+    def remove(self, entry):
+        i = bisect_left(self.starts, entry["start_min"])
+        while self.entries[i] is not entry:
+            i += 1
+        del self.starts[i]
+        del self.ends[i]
+        del self.entries[i]
+        self._fix_max_ends(i)
+
+    def _fix_max_ends(self, i):
+        del self.max_ends[i:]
+        m = self.max_ends[-1] if self.max_ends else -1
+        for e in self.ends[i:]:
+            if e > m:
+                m = e
+            self.max_ends.append(m)
+
+    def overlaps(self, s, e):
+        # same test as before: not (e <= start or end <= s)
+        found = []
+        j = bisect_left(self.starts, e) - 1
+        while j >= 0 and self.max_ends[j] > s:
+            if self.ends[j] > s:
+                found.append(self.entries[j])
+            j -= 1
+        return found
+
+    def any_overlap(self, s, e, pred):
+        """
+        Whether some entry overlapping s-e passes pred; stops at the first
+        """
+        j = bisect_left(self.starts, e) - 1
+        while j >= 0 and self.max_ends[j] > s:
+            if self.ends[j] > s and pred(self.entries[j]):
                 return True
-    return False
+            j -= 1
+        return False
+
+
+day_index = {}
+
+# bumped by every mutation helper below
+_version = 0
+
+def timetable_version():
+    return _version
+
+def _bump():
+    global _version
+    _version += 1
+
+def add_entry(entry):
+    prepare_entry(entry)
+    key = entry_key(entry)
+    # after equal keys, same order a stable re-sort would give
+    i = bisect_right(_keys, key)
+    _keys.insert(i, key)
+    timetable.insert(i, entry)
+    for day in entry_days(entry):
+        day_index.setdefault(day, DayIndex()).add(entry)
+    _bump()
+
+def remove_entry(idx):
+    entry = timetable.pop(idx)
+    del _keys[idx]
+    for day in entry_days(entry):
+        day_index[day].remove(entry)
+    _bump()
+    return entry
+
+def index_of(entry):
+    # position of an entry in the sorted timetable
+    i = bisect_left(_keys, entry_key(entry))
+    while timetable[i] is not entry:
+        i += 1
+    return i
+
+def replace_entry(idx, entry):
+    remove_entry(idx)
+    add_entry(entry)
+
+def set_timetable(entries):
+    for cls in entries:
+        prepare_entry(cls)
+    timetable.clear()
+    timetable.extend(entries)
+    sort_timetable()
+    day_index.clear()
+    for entry in timetable:
+        for day in entry_days(entry):
+            day_index.setdefault(day, DayIndex()).add(entry)
+    _bump()
+
+def events_on(day):
+    """
+    Entries for a weekday, sorted by start (the live bucket, don't mutate)
+    """
+    bucket = day_index.get(day)
+    return bucket.entries if bucket is not None else []
+
+@lru_cache(maxsize=1024)
+def weekday_name(yyyy_mm_dd):
+    # "2025-12-15" -> "Monday" without strptime/strftime round trips
+    return DAYS[date.fromisoformat(yyyy_mm_dd).weekday()]
+
+# --------------------------
+# Recurrence rules
+# --------------------------
+# An entry repeats every week on its "day" unless it has a rule:
+#   "repeat": {"every": 2,                    # every N weeks (default 1)
+#              "days": ["Monday", "Friday"],  # default [entry["day"]]
+#              "from": "2026-09-07",          # first date of the series
+#              "until": "2026-12-18",         # last date, inclusive
+#              "count": 24}                   # max occurrences from "from"
+# Single-date exceptions live in the overrides file as cancellations.
+
+def entry_days(cls):
+    rule = cls.get("repeat")
+    if rule and rule.get("days"):
+        return rule["days"]
+    return [cls["day"]]
+
+def check_repeat(rule):
+    """
+    Raise ValueError for a malformed rule, return it normalized
+    """
+    if not isinstance(rule, dict):
+        raise ValueError("Repeat rule must be an object")
+    rule = dict(rule)
+    every = rule.get("every", 1)
+    if not isinstance(every, int) or every < 1:
+        raise ValueError("Repeat interval must be a whole number of weeks")
+    days = rule.get("days") or []
+    if not isinstance(days, list):
+        raise ValueError("Repeat days must be a list of day names")
+    for day in days:
+        if day not in DAY_TO_INDEX:
+            raise ValueError(f"Unknown day {day!r}")
+    for key in ("from", "until"):
+        if rule.get(key):
+            try:
+                date.fromisoformat(rule[key])
+            except (TypeError, ValueError):
+                raise ValueError(f"Repeat {key!r} must be a YYYY-MM-DD date")
+    count = rule.get("count")
+    if count is not None and (not isinstance(count, int) or count < 1):
+        raise ValueError("Repeat count must be a positive number")
+    if (every > 1 or count) and not rule.get("from"):
+        raise ValueError("Repeat rule needs a 'from' date")
+    return rule
+
+def shift_repeat(rule, days):
+    """
+    A copy of rule moved days later (earlier if negative), weekdays too
+    """
+    rule = dict(rule)
+    for key in ("from", "until"):
+        if rule.get(key):
+            moved = date.fromisoformat(rule[key]) + timedelta(days=days)
+            rule[key] = moved.isoformat()
+    if rule.get("days"):
+        rule["days"] = [DAYS[(DAY_TO_INDEX[d] + days) % 7] for d in rule["days"]]
+    return rule
+
+def _monday(d):
+    return d.toordinal() - d.weekday()
+
+def occurs_on(cls, d):
+    """
+    Whether an entry happens on date d, O(1). The weekday is assumed to be
+    one of entry_days(cls) already (it came out of that day's bucket).
+    """
+    rule = cls.get("repeat")
+    if not rule:
+        return True
+
+    first = date.fromisoformat(rule["from"]) if rule.get("from") else None
+    if first is not None and d < first:
+        return False
+    if rule.get("until") and d > date.fromisoformat(rule["until"]):
+        return False
+    if first is None:
+        return True
+
+    every = rule.get("every", 1)
+    weeks = (_monday(d) - _monday(first)) // 7
+    if weeks % every:
+        return False
+
+    count = rule.get("count")
+    if count is None:
+        return True
+
+    # occurrences strictly before d: partial first week, whole aligned
+    # weeks in between, then the rule days earlier in d's own week
+    wds = sorted(DAY_TO_INDEX[day] for day in entry_days(cls))
+    in_first = sum(1 for w in wds if w >= first.weekday())
+    before_d = sum(1 for w in wds if w < d.weekday())
+    if weeks == 0:
+        n = sum(1 for w in wds if first.weekday() <= w < d.weekday())
+    else:
+        n = in_first + (weeks // every - 1) * len(wds) + before_d
+    return n < count
+
+def occurrences(cls, start, end):
+    """
+    Lazily yield the dates in start..end on which an entry happens
+    """
+    wds = {DAY_TO_INDEX[day] for day in entry_days(cls)}
+    d = start
+    while d <= end:
+        if d.weekday() in wds and occurs_on(cls, d):
+            yield d
+        d += timedelta(days=1)
+
+def _window(cls):
+    """
+    (first, last) dates an entry can happen on, None where unbounded.
+    A count limit bounds it by count aligned weeks at most.
+    """
+    rule = cls.get("repeat") or {}
+    first = date.fromisoformat(rule["from"]) if rule.get("from") else None
+    last = date.fromisoformat(rule["until"]) if rule.get("until") else None
+    if rule.get("count"):
+        by_count = first + timedelta(weeks=rule["count"] * rule.get("every", 1))
+        last = by_count if last is None else min(last, by_count)
+    return first, last
+
+def share_date(a, b, day):
+    """
+    Whether two entries can fall on the same date, a weekday named day
+    """
+    if not a.get("repeat") and not b.get("repeat"):
+        return True
+
+    fa, la = _window(a)
+    fb, lb = _window(b)
+    firsts = [d for d in (fa, fb) if d is not None]
+    lasts = [d for d in (la, lb) if d is not None]
+    lo = max(firsts) if firsts else None
+    hi = min(lasts) if lasts else None
+    if lo is not None and hi is not None and lo > hi:
+        return False
+
+    if hi is not None:
+        if lo is None:
+            # neither has a start, so both are plain weekly until hi
+            return True
+        # finite overlap of the windows: walk b's dates in it (b is a
+        # timetable entry, a may be a bare candidate)
+        wd = DAY_TO_INDEX[day]
+        return any(
+            d.weekday() == wd and occurs_on(a, d)
+            for d in occurrences(b, lo, hi)
+        )
+
+    # both open-ended: their week cycles meet unless they never align
+    ea = (a.get("repeat") or {}).get("every", 1)
+    eb = (b.get("repeat") or {}).get("every", 1)
+    if fa is None or fb is None:
+        return True  # no anchor means every week
+    weeks = (_monday(fa) - _monday(fb)) // 7
+    return weeks % gcd(ea, eb) == 0
+
+def overlaps(day, start, end):
+    """
+    All entries on day that overlap start-end
+    """
+    if day not in day_index:
+        return []
+    return day_index[day].overlaps(parse_time(start), parse_time(end))
+
+def conflicts(day, start, end, ignore_index=None, entry=None):
+    # entry: the candidate, for its repeat rule; None is plain weekly
+    if day not in day_index:
+        return False
+    ignore = timetable[ignore_index] if ignore_index is not None else None
+    entry = entry or {}
+    return day_index[day].any_overlap(
+        parse_time(start), parse_time(end),
+        lambda cls: cls is not ignore and share_date(entry, cls, day)
+    )
+
+# --------------------------
+# Bulk import
+# --------------------------
+def read_entries(path):
+    """
+    Read classes from a .csv (name,day,start,end[,category]) or .json file
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        entries = []
+        for row in rows:
+            entry = {k.strip(): (v or "").strip() for k, v in row.items() if k}
+            if not entry.get("category"):
+                entry.pop("category", None)
+            entries.append(entry)
+        return entries
+    with open(path, "r") as f:
+        return json.load(f)
+
+def describe(cls):
+    return f"{cls['day']} {cls['start']}-{cls['end']} {cls['name']}"
+
+def find_overlaps(entries):
+    """
+    Sweep each day once in start order and return every overlapping pair.
+    O(n log n) plus the number of pairs. Entries must be prepared.
+    """
+    by_day = {}
+    for cls in entries:
+        item = (cls["start_min"], cls["end_min"], cls)
+        for day in entry_days(cls):
+            by_day.setdefault(day, []).append(item)
+
+    pairs = []
+    for day, items in by_day.items():
+        items.sort(key=lambda x: (x[0], x[1]))
+        active = []  # heap of (end, seq, start, cls)
+        for seq, (s, e, cls) in enumerate(items):
+            while active and active[0][0] <= s:
+                heapq.heappop(active)
+            for ae, _, a_s, other in active:
+                if a_s < e and ae > s and share_date(other, cls, day):
+                    pairs.append((other, cls))
+            heapq.heappush(active, (e, seq, s, cls))
+    return pairs
+
+def assign_lanes(intervals):
+    """
+    Side-by-side layout for (start, end) minute pairs. A greedy sweep in
+    start order gives each interval the lowest lane free at its start;
+    every interval in a chain of overlaps shares that chain's lane count.
+    Returns (lane, lanes) per interval, in input order. O(n log n).
+    """
+    result = [None] * len(intervals)
+    active = []   # heap of (end, lane)
+    free = []     # heap of lanes released inside the current chain
+    chain = []
+    width = 0
+
+    for i in sorted(range(len(intervals)), key=lambda i: intervals[i]):
+        s, e = intervals[i]
+        while active and active[0][0] <= s:
+            heapq.heappush(free, heapq.heappop(active)[1])
+        if not active:
+            # nothing overlaps any more, the chain is closed
+            for j in chain:
+                result[j] = (result[j], width)
+            chain = []
+            free = []
+            width = 0
+        if free:
+            lane = heapq.heappop(free)
+        else:
+            lane = width
+            width += 1
+        heapq.heappush(active, (e, lane))
+        result[i] = lane
+        chain.append(i)
+
+    for j in chain:
+        result[j] = (result[j], width)
+    return result
+
+def bulk_add(entries):
+    """
+    Add many classes at once. All problems are collected and returned
+    together; nothing is added unless the list comes back empty.
+    """
+    if not isinstance(entries, list):
+        return ["Expected a list of classes at the top level."]
+    problems = []
+    valid = []
+    for n, cls in enumerate(entries, 1):
+        if not isinstance(cls, dict):
+            problems.append(f"Entry {n}: not a class record.")
+        elif not all(cls.get(k) for k in ("name", "day", "start", "end")):
+            problems.append(f"Entry {n}: needs name, day, start and end.")
+        elif cls["day"] not in DAYS:
+            problems.append(f"Entry {n}: unknown day {cls['day']!r}.")
+        elif not validate_time(cls["start"]) or not validate_time(cls["end"]):
+            problems.append(f"Entry {n}: invalid time, use HH:MM.")
+        elif parse_time(cls["end"]) <= parse_time(cls["start"]):
+            problems.append(f"Entry {n}: ends before it starts.")
+        else:
+            try:
+                valid.append(prepare_entry(cls))
+            except ValueError as e:
+                problems.append(f"Entry {n}: {e}.")
+
+    new = {id(cls) for cls in valid}
+    for a, b in find_overlaps(timetable + valid):
+        # clashes already in the timetable are not this import's fault
+        if id(a) in new or id(b) in new:
+            problems.append(f"Conflict: {describe(a)} overlaps {describe(b)}.")
+
+    if not problems:
+        # one sort for the whole batch
+        set_timetable(timetable + valid)
+    return problems
 
 def find_class_index(name, day, start):
-    for i, cls in enumerate(timetable):
-        if cls["name"] == name and cls["day"] == day and cls["start"] == start:
-            return i
+    # through the day bucket, so rules repeating on several days match too
+    bucket = day_index.get(day)
+    if bucket is None or not validate_time(start):
+        return None
+    s = parse_time(start)
+    i = bisect_left(bucket.starts, s)
+    while i < len(bucket.starts) and bucket.starts[i] == s:
+        cls = bucket.entries[i]
+        if cls["name"] == name and cls["start"] == start:
+            return index_of(cls)
+        i += 1
     return None
 
 def add_class():
@@ -52,8 +519,7 @@ def add_class():
     if conflicts(day, start, end):
         print("Conflict detected! Cannot add.")
     else:
-        timetable.append({"name": name, "day": day, "start": start, "end": end})
-        sort_timetable()
+        add_entry({"name": name, "day": day, "start": start, "end": end})
         print("Class added.")
 
 def update_class():
@@ -77,8 +543,7 @@ def update_class():
     if conflicts(new_day, new_start, new_end, ignore_index=idx):
         print("Conflict detected! Cannot update.")
     else:
-        timetable[idx] = {"name": new_name, "day": new_day, "start": new_start, "end": new_end}
-        sort_timetable()
+        replace_entry(idx, {"name": new_name, "day": new_day, "start": new_start, "end": new_end})
         print("Class updated.")
 
 def delete_class():
@@ -89,14 +554,13 @@ def delete_class():
     if idx is None:
         print("Class not found.")
     else:
-        timetable.pop(idx)
+        remove_entry(idx)
         print("Class deleted.")
 
 def show_day(day):
     print(f"--- {day} ---")
-    for cls in timetable:
-        if cls["day"] == day:
-            print(f"{cls['start']} - {cls['end']} | {cls['name']}")
+    for cls in events_on(day):
+        print(f"{cls['start']} - {cls['end']} | {cls['name']}")
 
 def show_today_and_tomorrow():
     today_idx = datetime.now().weekday()
@@ -108,7 +572,8 @@ def show_today_and_tomorrow():
 def weekly_summary():
     totals = {}
     for cls in timetable:
-        duration = parse_time(cls["end"]) - parse_time(cls["start"])
+        duration = cls["end_min"] - cls["start_min"]
+        duration *= len(entry_days(cls))
         totals[cls["name"]] = totals.get(cls["name"], 0) + duration
     print("--- Weekly Summary ---")
     for name, mins in totals.items():
@@ -117,18 +582,31 @@ def weekly_summary():
 def save_json():
     path = input("Enter filename to save (e.g. timetable.json): ")
     with open(path, "w") as f:
-        json.dump(timetable, f, indent=2)
+        json.dump(stored_entries(), f, indent=2)
     print("Saved.")
 
 def load_json():
     path = input("Enter filename to load (e.g. timetable.json): ")
     with open(path, "r") as f:
         data = json.load(f)
-        timetable.clear()
-        timetable.extend(data)
-    sort_timetable()
+    set_timetable(data)
     print("Loaded.")
 
+def import_classes():
+    path = input("Enter CSV or JSON file to import: ")
+    try:
+        entries = read_entries(path)
+    except (OSError, ValueError) as e:
+        print(f"Could not read {path}: {e}")
+        return
+    problems = bulk_add(entries)
+    if problems:
+        print("Nothing imported:")
+        for p in problems:
+            print(" -", p)
+    else:
+        print(f"Imported {len(entries)} classes.")
+
 def menu():
     while True:
         print("\n1. Add class")
@@ -138,6 +616,7 @@ def menu():
         print("5. Weekly summary")
         print("6. Save timetable (JSON)")
         print("7. Load timetable (JSON)")
+        print("8. Import classes (CSV/JSON)")
         print("0. Exit")
         choice = input("Choose: ")
         if choice == "1":
@@ -154,6 +633,8 @@ def menu():
             save_json()
         elif choice == "7":
             load_json()
+        elif choice == "8":
+            import_classes()
         elif choice == "0":
             break
         else:
@@ -1,21 +1,94 @@
-import json
+import sys
+import uuid
+from bisect import bisect_left, bisect_right, insort
 from datetime import datetime, date
 
+from storage_backend import make_storage
+
+# --------------------------
+# Shared date / value pools
+# --------------------------
+# Dates are kept as ordinals; both directions are cached so every task on
+# the same day shares one int and one string.
+_ORDINALS = {}
+_ISO_DATES = {}
+
+
+def to_ordinal(date_str):
+    if date_str is None:
+        return None
+    o = _ORDINALS.get(date_str)
+    if o is None:
+        # unparsable values are kept verbatim
+        if not isinstance(date_str, str) or len(date_str) != 10:
+            return date_str
+        try:
+            d = date.fromisoformat(date_str)
+        except ValueError:
+            return date_str
+        # only canonical YYYY-MM-DD (3.11 also accepts e.g. "2026-W42-1")
+        if d.isoformat() != date_str:
+            return date_str
+        o = d.toordinal()
+        date_str = sys.intern(date_str)
+        _ISO_DATES.setdefault(o, date_str)
+        _ORDINALS[date_str] = o
+    return o
+
+
+def from_ordinal(o):
+    if not isinstance(o, int):
+        return o
+    s = _ISO_DATES.get(o)
+    if s is None:
+        s = _ISO_DATES[o] = sys.intern(date.fromordinal(o).isoformat())
+        _ORDINALS[s] = o
+    return s
+
+
+# category / priority repeat across every task, keep one object per value
+_SHARED = {}
+
+
 # --------------------------
 # Task Class
 # --------------------------
 class Task:
+    __slots__ = ("id", "title", "_deadline", "priority", "category", "done",
+                 "_created")
+
     def __init__(self, title, deadline=None, priority="Medium",
-                 category="General", done=False):
+                 category="General", done=False, id=None, created_at=None):
+        self.id = id or str(uuid.uuid4())
         self.title = title
-        self.deadline = deadline  # "YYYY-MM-DD"
-        self.priority = priority  # High, Medium, Low
-        self.category = category
+        self._deadline = to_ordinal(deadline)  # "YYYY-MM-DD" as ordinal
+        self.priority = _SHARED.setdefault(priority, priority)  # High, Medium, Low
+        self.category = _SHARED.setdefault(category, category)
         self.done = done
-        self.created_at = datetime.now().strftime("%Y-%m-%d")
+        if created_at is None:
+            self._created = date.today().toordinal()
+        else:
+            self._created = to_ordinal(created_at)
+
+    @property
+    def deadline(self):
+        return from_ordinal(self._deadline)
+
+    @deadline.setter
+    def deadline(self, value):
+        self._deadline = to_ordinal(value)
+
+    @property
+    def created_at(self):
+        return from_ordinal(self._created)
+
+    @created_at.setter
+    def created_at(self, value):
+        self._created = to_ordinal(value)
 
     def to_dict(self):
         return {
+            "id": self.id,
             "title": self.title,
             "deadline": self.deadline,
             "priority": self.priority,
@@ -24,44 +97,216 @@ class Task:
             "created_at": self.created_at
         }
 
+# --------------------------
+# Task Index
+# --------------------------
+INDEXED_FIELDS = ("deadline", "category", "priority", "done")
+
+
+class TaskIndex:
+    """
+    Hash indexes field value -> tasks for the fields the GUI filters on.
+    Buckets are dicts used as ordered sets so removal is O(1), kept in
+    list order: order numbers each task by position, and a bucket a moved
+    task was appended to is re-sorted by it the next time it is read.
+    deadlines is the sorted list of distinct real dates, for range queries.
+    """
+    def __init__(self, tasks=()):
+        self.buckets = {}
+        self.order = {task: n for n, task in enumerate(tasks)}
+        self._next = len(self.order)
+        self.unsorted = set()  # (field, value) buckets out of list order
+        # bulk build one field at a time, avoids per-task method calls
+        for field in INDEXED_FIELDS:
+            index = self.buckets[field] = {}
+            for task in tasks:
+                value = getattr(task, field)
+                bucket = index.get(value)
+                if bucket is None:
+                    bucket = index[value] = {}
+                bucket[task] = None
+        self.deadlines = sorted(
+            d for d in self.buckets["deadline"] if d in _ORDINALS
+        )
+
+    def _put(self, field, value, task):
+        index = self.buckets[field]
+        bucket = index.get(value)
+        if bucket is None:
+            bucket = index[value] = {}
+            if field == "deadline" and value in _ORDINALS:
+                insort(self.deadlines, value)
+        bucket[task] = None
+
+    def _drop(self, field, value, task):
+        index = self.buckets[field]
+        bucket = index.get(value)
+        if bucket is None:
+            return
+        bucket.pop(task, None)
+        if not bucket:
+            del index[value]
+            self.unsorted.discard((field, value))
+            if field == "deadline" and value in _ORDINALS:
+                del self.deadlines[bisect_left(self.deadlines, value)]
+
+    def _bucket(self, field, value):
+        index = self.buckets[field]
+        if (field, value) in self.unsorted:
+            self.unsorted.discard((field, value))
+            if value in index:
+                index[value] = dict.fromkeys(
+                    sorted(index[value], key=self.order.__getitem__)
+                )
+        return index.get(value, {})
+
+    def add(self, task):
+        self.order[task] = self._next
+        self._next += 1
+        for field in INDEXED_FIELDS:
+            self._put(field, getattr(task, field), task)
+
+    def remove(self, task):
+        for field in INDEXED_FIELDS:
+            self._drop(field, getattr(task, field), task)
+        del self.order[task]
+
+    def move(self, task, old):
+        # re-bucket only the fields that changed; the task lands at the
+        # end of its new bucket, which is sorted back on the next read
+        for field in INDEXED_FIELDS:
+            value = getattr(task, field)
+            if value == old[field]:
+                continue
+            self._drop(field, old[field], task)
+            self._put(field, value, task)
+            self.unsorted.add((field, value))
+
+    def between(self, start, end):
+        """
+        (deadline, tasks) pairs for start <= deadline <= end, in date order
+        """
+        lo = bisect_left(self.deadlines, start)
+        hi = bisect_right(self.deadlines, end)
+        return [(d, list(self._bucket("deadline", d)))
+                for d in self.deadlines[lo:hi]]
+
+    def snapshot(self, task):
+        return {field: getattr(task, field) for field in self.buckets}
+
+    def select(self, filters):
+        # None = no indexed field in the filters, caller has to scan
+        keys = [k for k in filters if k in self.buckets]
+        if not keys:
+            return None
+
+        # walk the smallest bucket, check the rest per task
+        smallest = min(
+            (self._bucket(k, filters[k]) for k in keys), key=len
+        )
+        return [
+            t for t in smallest
+            if all(getattr(t, k) == v for k, v in filters.items())
+        ]
+
+
 # --------------------------
 # Task Manager
 # --------------------------
 class TaskManager:
-    def __init__(self, filename="tasks.json"):
+    def __init__(self, filename="tasks.json", storage="json"):
         self.filename = filename
-        self.tasks = []
+        self.storage = make_storage(storage, filename)
+        # by_id is the store, in list order; tasks is a list view of it
+        self.by_id = {}
+        self._tasks = None
+        self.index = TaskIndex()
         self.streak = 0
         self.last_done_date = None
+        # bumped on every change; caches compare it to spot stale data
+        self.version = 0
         self.load()
 
+    @property
+    def tasks(self):
+        """
+        All tasks in order, built from by_id on first use after a delete
+        or sort. Treat it as read-only; change tasks through the methods.
+        """
+        if self._tasks is None:
+            self._tasks = list(self.by_id.values())
+        return self._tasks
+
     # Add new task
     def add_task(self, title, deadline=None, priority="Medium", category="General"):
         task = Task(title, deadline, priority, category)
-        self.tasks.append(task)
-        self.save()
+        self.by_id[task.id] = task
+        if self._tasks is not None:
+            self._tasks.append(task)
+        self.index.add(task)
+        self._record("add", task, {"task": task.to_dict()})
+        return task
 
     # Delete task
     def delete_task(self, index):
         if 0 <= index < len(self.tasks):
-            self.tasks.pop(index)
-            self.save()
+            self.delete_by_id(self.tasks[index].id)
 
     # Edit task
     def edit_task(self, index, **updates):
         if 0 <= index < len(self.tasks):
-            task = self.tasks[index]
-            for key, value in updates.items():
-                if hasattr(task, key):
-                    setattr(task, key, value)
-            self.save()
+            self.update_by_id(self.tasks[index].id, **updates)
 
     # Mark as done / not done
     def mark_task(self, index, done=True):
         if 0 <= index < len(self.tasks):
-            self.tasks[index].done = done
-            self._update_streak(done)
-            self.save()
+            self.mark_by_id(self.tasks[index].id, done)
+
+    # -----------------------------
+    # ID based API (O(1) lookup)
+    # -----------------------------
+    def get_by_id(self, task_id):
+        return self.by_id.get(task_id)
+
+    def delete_by_id(self, task_id):
+        task = self.by_id.pop(task_id, None)
+        if task is None:
+            return None
+        # the list view is rebuilt when next asked for, not shifted now
+        self._tasks = None
+        self.index.remove(task)
+        self._record("delete", task, {"id": task_id})
+        return task
+
+    def update_by_id(self, task_id, **updates):
+        task = self.by_id.get(task_id)
+        if task is None:
+            return None
+        applied = {}
+        old = self.index.snapshot(task)
+        for key, value in updates.items():
+            if hasattr(task, key) and key != "id":
+                setattr(task, key, value)
+                applied[key] = value
+        self.index.move(task, old)
+        self._record("edit", task, {"id": task_id, "updates": applied})
+        return task
+
+    def mark_by_id(self, task_id, done=True):
+        task = self.by_id.get(task_id)
+        if task is None:
+            return None
+        old = self.index.snapshot(task)
+        task.done = done
+        self.index.move(task, old)
+        self._update_streak(done)
+        self._record("mark", task, {
+            "id": task_id,
+            "done": done,
+            "streak": self.streak,
+            "last_done_date": self.last_done_date
+        })
+        return task
 
     # Track daily streak
     def _update_streak(self, done):
@@ -91,52 +336,133 @@ class TaskManager:
 
     # Filter tasks
     def filter_tasks(self, **filters):
+        found = self.storage.query(filters)
+        if found is None:
+            found = self.index.select(filters)
+        if found is not None:
+            return found
+
         results = self.tasks
         for key, value in filters.items():
             results = [t for t in results if getattr(t, key) == value]
         return results
 
+    # Search titles
+    def search(self, query, within=None):
+        """
+        Tasks whose title contains query, ignoring case. within scopes
+        the search to some candidates (one day's tasks), default all
+        """
+        q = query.lower()
+        return [
+            t for t in (self.tasks if within is None else within)
+            if q in t.title.lower()
+        ]
+
     # Sort tasks
     def sort_tasks(self, key="deadline"):
         try:
-            self.tasks.sort(key=lambda t: getattr(t, key) or "")
+            ordered = sorted(self.by_id.values(),
+                             key=lambda t: getattr(t, key) or "")
         except Exception:
             print("Unable to sort by", key)
-
-    # Save to JSON
-    def save(self):
-        data = {
-            "tasks": [t.to_dict() for t in self.tasks],
+            return
+        # re-fill in place, storage holds a view of this dict
+        self.by_id.clear()
+        self.by_id.update((t.id, t) for t in ordered)
+        self._tasks = ordered
+        # keep bucket order in step with the new list order
+        self.index = TaskIndex(ordered)
+        self._record("sort", None, {"key": key})
+
+    # Persist one mutation (journal append or full rewrite)
+    def _record(self, op, task, fields):
+        self.version += 1
+        self.storage.record(op, task, fields, self._snapshot)
+
+    def _snapshot(self):
+        return {
+            "tasks": [t.to_dict() for t in self.by_id.values()],
             "streak": self.streak,
             "last_done_date": self.last_done_date
         }
-        json.dump(data, open(self.filename, "w"), indent=4)
+
+    # Save to JSON
+    def save(self):
+        self.storage.save(self._snapshot())
 
     # Load from JSON
     def load(self):
         try:
-            data = json.load(open(self.filename))
-            self.streak = data.get("streak", 0)
-            self.last_done_date = data.get("last_done_date", None)
+            data = self.storage.load()
 
-            self.tasks = []
+            tasks = []
+            missing_ids = False
             for t in data.get("tasks", []):
                 task = Task(
                     t["title"],
                     t["deadline"],
                     t["priority"],
                     t["category"],
-                    t["done"]
+                    t["done"],
+                    t.get("id"),
+                    t["created_at"]
                 )
-                task.created_at = t["created_at"]
-                self.tasks.append(task)
+                tasks.append(task)
+                missing_ids = missing_ids or not t.get("id")
+
+            # read after the tasks: a streamed load fills these in last
+            self.streak = data.get("streak", 0)
+            self.last_done_date = data.get("last_done_date", None)
 
         except FileNotFoundError:
+            tasks = []
+            missing_ids = True
+
+        self.by_id = {t.id: t for t in tasks}
+        self._tasks = None
+        self.index = TaskIndex(self.by_id.values())
+        self.storage.bind(self.by_id.values())
+        self.version += 1
+
+        # persist freshly assigned ids so they stay stable across runs
+        if missing_ids:
             self.save()
+
+    # Tasks due in a date window, via the sorted deadline index
+    def tasks_between(self, start, end, include_done=True):
+        """
+        (deadline, tasks) pairs for ISO dates start..end inclusive
+        """
+        found = []
+        for d, tasks in self.index.between(start, end):
+            if not include_done:
+                tasks = [t for t in tasks if not t.done]
+            if tasks:
+                found.append((d, tasks))
+        return found
+
     def get_tasks_by_date(self, date_str):
-        return [t for t in self.tasks if t.deadline == date_str]
+        return self.filter_tasks(deadline=date_str)
+
+# --------------------------
+# Shared instance
+# --------------------------
+_shared_tm = None
+
+
+def get_task_manager(filename="tasks.json", storage="json"):
+    """
+    One TaskManager per process, loaded on first use rather than at import
+    """
+    global _shared_tm
+    if _shared_tm is None:
+        _shared_tm = TaskManager(filename, storage)
+    return _shared_tm
+
 
-tm = TaskManager()
+# CLI instance, created under __main__ so importing this module is free
+tm = None
 
 def show_menu():
     print("\n===== TO-DO LIST MENU =====")
@@ -285,4 +611,5 @@ def main():
             print("Invalid choice! Try again.")
 
 if __name__ == "__main__":
+    tm = get_task_manager()
     main()